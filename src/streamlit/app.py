@@ -188,6 +188,15 @@ st.markdown("""
     padding-bottom: 10px;
     border-bottom: 2px solid #e2e8f0;
 }
+
+/* Botão de download do relatório PDF MCDA (key="cp2b_pdf_download") */
+.st-key-cp2b_pdf_download button {
+    background-color: #2c5530;
+    color: white;
+    border: none;
+    border-radius: 6px;
+    font-weight: bold;
+}
 </style>
 
 <div style='background: linear-gradient(135deg, #2c5530 0%, #4a7c59 100%); 
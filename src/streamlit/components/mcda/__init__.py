@@ -1,6 +1,9 @@
 # CP2B MCDA Module
 # Módulo integrado para análise MCDA das propriedades CP2B
 
+import importlib
+import importlib.util
+
 from .data_loader import (
     load_cp2b_complete_database,
     load_cp2b_spatial_data,
@@ -30,22 +33,25 @@ from .invisible_map import (
     render_invisible_polygons_map
 )
 
-from .report_component import (
-    render_property_report_page
-)
-
 # Report components (now in same directory)
-try:
-    from .simple_report_component import render_simple_property_report
-    SIMPLE_REPORT_AVAILABLE = True
-except ImportError:
-    SIMPLE_REPORT_AVAILABLE = False
+# Carregados no primeiro acesso ao nome (__getattr__): importar o pacote não importa o Plotly
+LAZY_REPORT_EXPORTS = {
+    'render_property_report_page': '.report_component',
+    'render_simple_property_report': '.simple_report_component',
+    'render_enhanced_property_report': '.enhanced_report_component'
+}
+
+# Os relatórios simples e aprimorado dependem do Plotly; disponibilidade verificada sem importá-lo
+SIMPLE_REPORT_AVAILABLE = importlib.util.find_spec('plotly') is not None
+ENHANCED_REPORT_AVAILABLE = SIMPLE_REPORT_AVAILABLE
 
-try:
-    from .enhanced_report_component import render_enhanced_property_report
-    ENHANCED_REPORT_AVAILABLE = True
-except ImportError:
-    ENHANCED_REPORT_AVAILABLE = False
+def __getattr__(name):
+    module_name = LAZY_REPORT_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     'load_cp2b_complete_database',
@@ -2,8 +2,12 @@
 # Carrega e processa dados do projeto CP2B para integração com dashboard
 
 import pandas as pd
+import numpy as np
 import geopandas as gpd
+import shapely
+import pyarrow.parquet as pq
 import streamlit as st
+import hashlib
 import json
 from typing import Dict, Any, Optional
 import logging
@@ -22,6 +26,111 @@ MCDA_SCENARIOS = {
 # Configuração do caminho dos dados
 CP2B_DATA_PATH = Path(__file__).parent.parent  # Vai para o diretório streamlit (onde estão os arquivos)
 
+# Precisão das coordenadas (graus): 5 casas decimais ≈ 1 m, reduz o GeoJSON enviado ao navegador
+COORDINATE_PRECISION = 1e-5
+
+
+def quantize_geometries(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """
+    Arredonda as coordenadas para COORDINATE_PRECISION (executado uma vez no carregamento em cache)
+    
+    Args:
+        gdf: GeoDataFrame em coordenadas geográficas
+    
+    Returns:
+        gpd.GeoDataFrame: Mesmo GeoDataFrame com geometrias quantizadas
+    """
+    if gdf.empty or (gdf.crs is not None and not gdf.crs.is_geographic):
+        return gdf
+    # 'pointwise' só arredonda vértices; o modo padrão reconstrói a topologia e falha em polígonos inválidos
+    gdf[gdf.geometry.name] = shapely.set_precision(gdf.geometry.values, COORDINATE_PRECISION, mode='pointwise')
+    return gdf
+
+
+class SharedAttr:
+    """
+    Envelope para valores guardados em DataFrame.attrs.
+    O pandas copia attrs em profundidade a cada DataFrame derivado (filtros, slices);
+    o envelope devolve a si mesmo na cópia, então o valor é compartilhado, não duplicado.
+    """
+    __slots__ = ('value',)
+    
+    def __init__(self, value: Any):
+        self.value = value
+    
+    def __copy__(self) -> 'SharedAttr':
+        return self
+    
+    def __deepcopy__(self, memo: dict) -> 'SharedAttr':
+        return self
+    
+    def __getstate__(self) -> Any:
+        return self.value
+    
+    def __setstate__(self, value: Any) -> None:
+        self.value = value
+
+
+def build_code_index(gdf: pd.DataFrame) -> None:
+    """
+    Guarda em gdf.attrs['code_index'] o dicionário cod_imovel -> rótulo do índice (calculado no carregamento)
+    Rótulos, e não posições, continuam válidos nos DataFrames filtrados derivados do carregado.
+    """
+    if 'cod_imovel' not in gdf.columns or not gdf.index.is_unique:
+        return
+    gdf.attrs['code_index'] = SharedAttr(dict(zip(gdf['cod_imovel'].to_numpy(), gdf.index)))
+
+
+def find_property_row(df: pd.DataFrame, cod_imovel: str) -> Optional[pd.Series]:
+    """
+    Localiza a linha de uma propriedade: O(1) via attrs['code_index'], varredura da coluna como alternativa
+    
+    Returns:
+        pd.Series: Linha da propriedade, ou None se ela não está no DataFrame
+    """
+    code_index = df.attrs.get('code_index')
+    if code_index is not None:
+        label = code_index.value.get(cod_imovel)
+        if label is None:
+            return None
+        if label in df.index:
+            row = df.loc[label]
+            if row['cod_imovel'] == cod_imovel:
+                return row
+        elif not df.index.equals(pd.RangeIndex(len(df))):
+            # Rótulos preservados e ausentes: a linha foi filtrada deste DataFrame
+            return None
+        # Índice redefinido (reset_index): rótulos não valem mais, varrer a coluna
+    
+    matches = np.flatnonzero(df['cod_imovel'].to_numpy() == cod_imovel)
+    return df.iloc[matches[0]] if len(matches) else None
+
+
+def frame_fingerprint(df: pd.DataFrame) -> tuple:
+    """
+    Chave de cache barata para DataFrames de propriedades (usada em hash_funcs)
+    
+    Considera o conjunto/ordem de cod_imovel e os scores, que mudam entre cenários de raio.
+    """
+    key_cols = [col for col in ('cod_imovel', 'mcda_score') if col in df.columns]
+    if not key_cols:
+        return (len(df), int(pd.util.hash_pandas_object(df.index).sum()))
+    return (len(df), int(pd.util.hash_pandas_object(df[key_cols], index=False).sum()))
+
+
+def frame_content_hash(df: pd.DataFrame) -> str:
+    """
+    Hash do conteúdo completo de um DataFrame (usado em hash_funcs de st.cache_data)
+    
+    Cobre índice, nomes e valores de todas as colunas; geometrias entram pelo WKB.
+    """
+    digest = hashlib.sha1(repr((df.shape, list(df.columns))).encode())
+    geometry_cols = [col for col in df.columns if isinstance(df[col].dtype, gpd.array.GeometryDtype)]
+    digest.update(pd.util.hash_pandas_object(df.drop(columns=geometry_cols), index=True).to_numpy().tobytes())
+    for col in geometry_cols:
+        digest.update(b''.join(wkb or b'' for wkb in shapely.to_wkb(np.asarray(df[col].values))))
+    return digest.hexdigest()
+
 
 @st.cache_data
 def load_mcda_geoparquet_by_radius(radius: str = '30km') -> gpd.GeoDataFrame:
@@ -71,6 +180,8 @@ def load_mcda_geoparquet_by_radius(radius: str = '30km') -> gpd.GeoDataFrame:
             logger.warning(f"⚠️ Arquivo {geoparquet_filename} está vazio")
             return load_cp2b_geoparquet_fallback()
             
+        gdf = quantize_geometries(gdf)
+            
         # Verificar e ajustar colunas de município
         if 'municipio' not in gdf.columns:
             if 'municipio_x' in gdf.columns:
@@ -81,6 +192,14 @@ def load_mcda_geoparquet_by_radius(radius: str = '30km') -> gpd.GeoDataFrame:
                 logger.info(f"✅ Coluna 'municipio' criada a partir de 'municipio_y'")
             else:
                 logger.warning(f"⚠️ Nenhuma coluna de município encontrada no arquivo {geoparquet_filename}")
+        
+        # Poucos municípios distintos: categórico torna igualdade, unique e map comparações de códigos inteiros
+        if 'municipio' in gdf.columns:
+            gdf['municipio'] = gdf['municipio'].astype('category')
+        
+        build_code_index(gdf)
+        # Raio de origem: o mapa invisível localiza por ele o sidecar de detecção de clique
+        gdf.attrs['mcda_radius'] = radius
                 
         # Verificar se as colunas essenciais existem
         required_cols = ['cod_imovel', 'geometry']
@@ -240,9 +359,9 @@ def get_property_details(cod_imovel: str, radius: str = '30km') -> Optional[Dict
             logger.info(f"🔍 Checking path: {mcda_path}")
             if mcda_path.exists():
                 logger.info(f"✅ Loading property details from {mcda_file}")
-                gdf = gpd.read_parquet(mcda_path)
-                # Convert to regular DataFrame for consistency, keeping all columns except geometry
-                df = pd.DataFrame(gdf.drop(columns=['geometry']) if 'geometry' in gdf.columns else gdf)
+                # Projeção de colunas: a geometria não é lida nem decodificada para o relatório
+                columns = [col for col in pq.read_schema(mcda_path).names if col != 'geometry']
+                df = pd.read_parquet(mcda_path, columns=columns)
                 
                 # Fix municipio column - MCDA files have municipio_x and municipio_y
                 if 'municipio' not in df.columns:
@@ -5,8 +5,10 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Mapping
+from types import MappingProxyType
 import logging
+import bisect
 from datetime import datetime
 import numpy as np
 
@@ -46,6 +48,196 @@ BIOMASS_SOURCES = {
     "Milho": {"residues": ["palha", "sabugo"], "yield_factor": 0.22, "biogas_potential": 350}
 }
 
+# Thresholds realistas por raio
+CLASSIFICATION_THRESHOLDS = {
+    '10km': {'excellent': 61.3, 'very_good': 57.1, 'viable': 50.9},
+    '30km': {'excellent': 65.5, 'very_good': 62.9, 'viable': 58.6}, 
+    '50km': {'excellent': 75.8, 'very_good': 72.8, 'viable': 69.5}
+}
+
+# Resultados de classificação imutáveis, compartilhados entre chamadas
+_CLASSIFICATION_EXCELLENT = MappingProxyType({
+    'name': 'Excelente',
+    'description': 'Localização ideal para planta de biogás',
+    'recommendation': '🏆 **Altamente Recomendado**: Esta propriedade apresenta excelentes condições para desenvolvimento de projeto de biogás. Prosseguir com estudos detalhados imediatamente.',
+    'icon': '🏆',
+    'color': '#228B22'
+})
+_CLASSIFICATION_VERY_GOOD = MappingProxyType({
+    'name': 'Muito Bom',
+    'description': 'Localização com bom potencial',
+    'recommendation': '⭐ **Recomendado**: Propriedade com muito bom potencial. Realizar análise econômica detalhada e estudos complementares.',
+    'icon': '⭐',
+    'color': '#32CD32'
+})
+_CLASSIFICATION_VIABLE = MappingProxyType({
+    'name': 'Viável',
+    'description': 'Localização com potencial adequado',
+    'recommendation': '✅ **Viável com Ressalvas**: Potencial adequado identificado. Necessária análise cuidadosa de viabilidade econômica.',
+    'icon': '✅',
+    'color': '#FFD700'
+})
+_CLASSIFICATION_LIMITED = MappingProxyType({
+    'name': 'Limitado',
+    'description': 'Potencial abaixo do ideal',
+    'recommendation': '⚠️ **Potencial Limitado**: Score abaixo dos critérios técnicos. Considerar melhorias ou localização alternativa.',
+    'icon': '⚠️',
+    'color': '#FF4500'
+})
+
+# Gauge do score MCDA: estrutura fixa construída uma vez, apenas valor/título/cor mudam
+GAUGE_BAR_THRESHOLDS = np.array([30, 50, 70])
+GAUGE_BAR_COLORS = (
+    "#dc3545",  # Vermelho
+    "#fd7e14",  # Laranja
+    "#ffc107",  # Amarelo
+    "#28a745"   # Verde
+)
+
+GAUGE_TEMPLATE = go.Indicator(
+    mode = "gauge+number+delta",
+    domain = {'x': [0, 1], 'y': [0, 1]},
+    title = {'font': {'size': 16}},
+    number = {'font': {'size': 28}},
+    gauge = {
+        'axis': {
+            'range': [0, 100],  # Escala fixa de 0 a 100
+            'tickmode': 'linear',
+            'tick0': 0,
+            'dtick': 20,  # Marcações de 20 em 20 (0, 20, 40, 60, 80, 100)
+            'tickfont': {'size': 12}
+        },
+        'bar': {'thickness': 0.3},
+        'bgcolor': "white",
+        'borderwidth': 2,
+        'bordercolor': "gray",
+        'steps': [
+            {'range': [0, 30], 'color': "#ffebee"},    # Vermelho claro
+            {'range': [30, 50], 'color': "#fff3e0"},   # Laranja claro  
+            {'range': [50, 70], 'color': "#fffde7"},   # Amarelo claro
+            {'range': [70, 100], 'color': "#e8f5e8"}   # Verde claro
+        ],
+        'threshold': {
+            'line': {'color': "red", 'width': 3},
+            'thickness': 0.8,
+            'value': 90
+        }
+    }
+)
+
+# Faixas de classificação (limites inferiores, em ordem crescente) indexadas via bisect
+AREA_THRESHOLDS_HA = (100, 500, 1000)
+AREA_CLASSES = (
+    ("🏘️ Propriedade Pequena", "Limitada para biogás comercial"),
+    ("🏠 Propriedade Média", "Viável para plantas pequenas"),
+    ("🏢 Propriedade Média-Grande", "Adequada para plantas comerciais"),
+    ("🏭 Grande Propriedade", "Excelente para plantas industriais")
+)
+
+CAPACITY_THRESHOLDS_KW = (250, 500, 1000)
+CAPACITY_VIABILITY = (
+    ("❌", "Abaixo do mínimo viável (250 kW)"),
+    ("🔍", "Limiar mínimo de viabilidade"),
+    ("⚠️", "Boa, mas requer análise cuidadosa"),
+    ("✅", "Excelente para viabilidade comercial")
+)
+TECHNICAL_VIABILITY_LABELS = (
+    "Limitada (<250kW)",
+    "Adequada (250-500kW)",
+    "Boa (500kW-1MW)",
+    "Excelente (>1MW)"
+)
+
+ANIMAL_SOURCES = ('Bovinos', 'Suínos')
+
+# Mix regional típico da RMC baseado em dados reais
+REGIONAL_MIX = {
+    '10km': {
+        'Cana-de-açúcar': {'proportion': 0.35, 'area_factor': 50, 'productivity': 80},
+        'Citros': {'proportion': 0.20, 'area_factor': 20, 'productivity': 25}, 
+        'Bovinos': {'proportion': 0.25, 'area_factor': 30, 'productivity': 2.5},
+        'Soja': {'proportion': 0.12, 'area_factor': 15, 'productivity': 3.2},
+        'Milho': {'proportion': 0.08, 'area_factor': 10, 'productivity': 5.8}
+    },
+    '30km': {
+        'Cana-de-açúcar': {'proportion': 0.32, 'area_factor': 120, 'productivity': 80},
+        'Citros': {'proportion': 0.18, 'area_factor': 45, 'productivity': 25},
+        'Bovinos': {'proportion': 0.28, 'area_factor': 80, 'productivity': 2.5},
+        'Suínos': {'proportion': 0.12, 'area_factor': 15, 'productivity': 0.8},
+        'Soja': {'proportion': 0.10, 'area_factor': 35, 'productivity': 3.2}
+    },
+    '50km': {
+        'Cana-de-açúcar': {'proportion': 0.28, 'area_factor': 200, 'productivity': 80},
+        'Bovinos': {'proportion': 0.32, 'area_factor': 150, 'productivity': 2.5},
+        'Citros': {'proportion': 0.15, 'area_factor': 75, 'productivity': 25},
+        'Suínos': {'proportion': 0.15, 'area_factor': 25, 'productivity': 0.8},
+        'Soja': {'proportion': 0.10, 'area_factor': 50, 'productivity': 3.2}
+    }
+}
+
+def _build_mix_arrays(mix: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Converte o mix regional em arrays paralelos (SoA) para o kernel numérico"""
+    sources = tuple(source for source in mix if source in BIOMASS_SOURCES)
+    return {
+        'sources': sources,
+        'area_factors': np.array([mix[s]['area_factor'] for s in sources], dtype=np.float64),
+        'productivities': np.array([mix[s]['productivity'] for s in sources], dtype=np.float64),
+        'yield_factors': np.array([BIOMASS_SOURCES[s]['yield_factor'] for s in sources], dtype=np.float64),
+        'biogas_potentials': np.array([BIOMASS_SOURCES[s]['biogas_potential'] for s in sources], dtype=np.float64),
+        'is_animal': np.array([s in ANIMAL_SOURCES for s in sources], dtype=np.bool_),
+        'residues': tuple(", ".join(BIOMASS_SOURCES[s]['residues']) for s in sources)
+    }
+
+REGIONAL_MIX_ARRAYS = {radius: _build_mix_arrays(mix) for radius, mix in REGIONAL_MIX.items()}
+
+# Formatação aplicada uma única vez na tabela de fontes (valores armazenados como float);
+# a produção das fontes animais (ANIMAL_SOURCES) é de dejetos, com uma casa decimal
+SOURCES_TABLE_FORMAT = {
+    'Produção Estimada': '{:,.0f} t/ano',
+    'Potencial Biogás': '{:,.0f} Nm³/ano'
+}
+ANIMAL_PRODUCTION_FORMAT = '{:,.1f} t dejetos/ano'
+
+PROPERTY_CHARACTERISTICS_TEMPLATE = """
+        - **Área Total**: {area_ha:,.1f} hectares
+        - **Score de Biomassa**: {biomass_score:.1f}/100
+        - **Raio de Captação**: {radius}
+        - **Município**: {municipio}
+        """
+
+ENERGY_PARAMETERS_TEMPLATE = """
+            - **Potencial Energético**: {energy_mwh_year:,.0f} MWh/ano
+            - **Equivalente**: {energy_gj_year:,.0f} GJ/ano
+            - **Capacidade Instalada**: {plant_capacity_kw:,.0f} kW
+            - **Fator de Capacidade**: {capacity_factor:.0%}
+            - **Energia Líquida**: {net_energy_mwh_year:,.0f} MWh/ano
+            """
+
+ENERGY_EQUIVALENCES_TEMPLATE = """
+            - **Residências Atendidas**: ~{households_served:,.0f} casas/ano
+            - **Equivalente Diesel**: {diesel_liters:,.0f} litros/ano
+            - **Redução CO₂**: ~{co2_reduction_t:,.0f} t CO₂eq/ano
+            """
+
+def _biomass_kernel(area_ha, score_factor, area_factors, productivities,
+                    yield_factors, biogas_pots, is_animal):
+    """
+    Kernel numérico (vetorizado em NumPy) da simulação por fonte.
+    Retorna (produção t/ano, biogás Nm³/ano, cabeças ou hectares efetivos).
+    """
+    effective_area = area_ha * score_factor * (area_factors / 100.0)
+    # Animais: cabeças; culturas: produção agrícola em t/ano
+    base = effective_area * productivities
+    manure_kg_year = base * yield_factors * 365.0
+    production = np.where(is_animal, manure_kg_year / 1000.0, base)
+    biogas = np.where(
+        is_animal,
+        manure_kg_year * biogas_pots / 1000.0,
+        base * yield_factors * biogas_pots
+    )
+    animals_or_area = np.where(is_animal, base, effective_area)
+    return production, biogas, animals_or_area
+
 def render_enhanced_property_report(property_data: Dict[str, Any], radius: str = '30km') -> None:
     """
     Renderiza relatório aprimorado e detalhado da propriedade
@@ -342,8 +534,13 @@ def render_quantitative_biomass_analysis(property_data: Dict[str, Any], radius:
         with col1:
             # Tabela de fontes
             df_sources = pd.DataFrame(sources_data)
+            sources_table = df_sources[['Fonte', 'Produção Estimada', 'Biogás (Nm³)']].rename(
+                columns={'Biogás (Nm³)': 'Potencial Biogás'})
+            animal_rows = sources_table.index[sources_table['Fonte'].isin(ANIMAL_SOURCES)]
             st.dataframe(
-                df_sources[['Fonte', 'Produção Estimada', 'Potencial Biogás']],
+                sources_table.style
+                .format(SOURCES_TABLE_FORMAT)
+                .format(ANIMAL_PRODUCTION_FORMAT, subset=(animal_rows, ['Produção Estimada'])),
                 use_container_width=True,
                 hide_index=True
             )
@@ -617,50 +814,22 @@ def render_technical_recommendations(property_data: Dict[str, Any], radius: str)
 # FUNÇÕES AUXILIARES
 # ========================================
 
-def get_enhanced_classification(score: float, radius: str) -> Dict[str, str]:
-    """Classificação aprimorada baseada em score e raio"""
-    
-    # Thresholds realistas por raio
-    thresholds = {
-        '10km': {'excellent': 61.3, 'very_good': 57.1, 'viable': 50.9},
-        '30km': {'excellent': 65.5, 'very_good': 62.9, 'viable': 58.6}, 
-        '50km': {'excellent': 75.8, 'very_good': 72.8, 'viable': 69.5}
-    }
+def get_enhanced_classification(score: float, radius: str) -> Mapping[str, str]:
+    """
+    Classificação aprimorada baseada em score e raio.
+    Retorna um mapeamento somente leitura compartilhado; use dict(result) para alterar.
+    """
     
-    current_thresholds = thresholds.get(radius, thresholds['30km'])
+    current_thresholds = CLASSIFICATION_THRESHOLDS.get(radius, CLASSIFICATION_THRESHOLDS['30km'])
     
     if score >= current_thresholds['excellent']:
-        return {
-            'name': 'Excelente',
-            'description': 'Localização ideal para planta de biogás',
-            'recommendation': '🏆 **Altamente Recomendado**: Esta propriedade apresenta excelentes condições para desenvolvimento de projeto de biogás. Prosseguir com estudos detalhados imediatamente.',
-            'icon': '🏆',
-            'color': '#228B22'
-        }
+        return _CLASSIFICATION_EXCELLENT
     elif score >= current_thresholds['very_good']:
-        return {
-            'name': 'Muito Bom',
-            'description': 'Localização com bom potencial',
-            'recommendation': '⭐ **Recomendado**: Propriedade com muito bom potencial. Realizar análise econômica detalhada e estudos complementares.',
-            'icon': '⭐',
-            'color': '#32CD32'
-        }
+        return _CLASSIFICATION_VERY_GOOD
     elif score >= current_thresholds['viable']:
-        return {
-            'name': 'Viável',
-            'description': 'Localização com potencial adequado',
-            'recommendation': '✅ **Viável com Ressalvas**: Potencial adequado identificado. Necessária análise cuidadosa de viabilidade econômica.',
-            'icon': '✅',
-            'color': '#FFD700'
-        }
+        return _CLASSIFICATION_VIABLE
     else:
-        return {
-            'name': 'Limitado',
-            'description': 'Potencial abaixo do ideal',
-            'recommendation': '⚠️ **Potencial Limitado**: Score abaixo dos critérios técnicos. Considerar melhorias ou localização alternativa.',
-            'icon': '⚠️',
-            'color': '#FF4500'
-        }
+        return _CLASSIFICATION_LIMITED
 
 def get_restriction_impact_level(score: float) -> Dict[str, str]:
     """Determina nível de impacto das restrições"""
@@ -677,14 +846,7 @@ def get_restriction_impact_level(score: float) -> Dict[str, str]:
 def get_technical_viability(capacity_kw: float) -> str:
     """Avalia viabilidade técnica baseada na capacidade"""
     
-    if capacity_kw >= 1000:
-        return "Excelente (>1MW)"
-    elif capacity_kw >= 500:
-        return "Boa (500kW-1MW)"
-    elif capacity_kw >= 250:
-        return "Adequada (250-500kW)"
-    else:
-        return "Limitada (<250kW)"
+    return TECHNICAL_VIABILITY_LABELS[bisect.bisect_right(CAPACITY_THRESHOLDS_KW, capacity_kw)]
 
 def create_score_gauge(score: float, radius: str) -> go.Figure:
     """Cria gráfico de gauge para o score com escala correta"""
@@ -693,46 +855,14 @@ def create_score_gauge(score: float, radius: str) -> go.Figure:
     score_clamped = min(max(score, 0), 100)
     
     # Determinar cor baseada no score
-    if score_clamped >= 70:
-        bar_color = "#28a745"  # Verde
-    elif score_clamped >= 50:
-        bar_color = "#ffc107"  # Amarelo
-    elif score_clamped >= 30:
-        bar_color = "#fd7e14"  # Laranja
-    else:
-        bar_color = "#dc3545"  # Vermelho
-    
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number+delta",
-        value = score_clamped,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': f"Score MCDA<br>Cenário {radius}", 'font': {'size': 16}},
-        number = {'font': {'size': 28}},
-        gauge = {
-            'axis': {
-                'range': [0, 100],  # Escala fixa de 0 a 100
-                'tickmode': 'linear',
-                'tick0': 0,
-                'dtick': 20,  # Marcações de 20 em 20 (0, 20, 40, 60, 80, 100)
-                'tickfont': {'size': 12}
-            },
-            'bar': {'color': bar_color, 'thickness': 0.3},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': [0, 30], 'color': "#ffebee"},    # Vermelho claro
-                {'range': [30, 50], 'color': "#fff3e0"},   # Laranja claro  
-                {'range': [50, 70], 'color': "#fffde7"},   # Amarelo claro
-                {'range': [70, 100], 'color': "#e8f5e8"}   # Verde claro
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 3},
-                'thickness': 0.8,
-                'value': 90
-            }
-        }
-    ))
+    bar_color = GAUGE_BAR_COLORS[int(np.searchsorted(GAUGE_BAR_THRESHOLDS, score_clamped, side='right'))]
+    
+    fig = go.Figure(GAUGE_TEMPLATE)
+    fig.update_traces(
+        value=score_clamped,
+        title_text=f"Score MCDA<br>Cenário {radius}",
+        gauge_bar_color=bar_color
+    )
     
     fig.update_layout(
         height=300, 
@@ -775,74 +905,21 @@ def simulate_biomass_sources(biomass_score: float, area_ha: float, radius: str)
     # Base de cálculo mais realista
     sources_data = []
     
-    # Mix regional típico da RMC baseado em dados reais
-    regional_mix = {
-        '10km': {
-            'Cana-de-açúcar': {'proportion': 0.35, 'area_factor': 50, 'productivity': 80},
-            'Citros': {'proportion': 0.20, 'area_factor': 20, 'productivity': 25}, 
-            'Bovinos': {'proportion': 0.25, 'area_factor': 30, 'productivity': 2.5},
-            'Soja': {'proportion': 0.12, 'area_factor': 15, 'productivity': 3.2},
-            'Milho': {'proportion': 0.08, 'area_factor': 10, 'productivity': 5.8}
-        },
-        '30km': {
-            'Cana-de-açúcar': {'proportion': 0.32, 'area_factor': 120, 'productivity': 80},
-            'Citros': {'proportion': 0.18, 'area_factor': 45, 'productivity': 25},
-            'Bovinos': {'proportion': 0.28, 'area_factor': 80, 'productivity': 2.5},
-            'Suínos': {'proportion': 0.12, 'area_factor': 15, 'productivity': 0.8},
-            'Soja': {'proportion': 0.10, 'area_factor': 35, 'productivity': 3.2}
-        },
-        '50km': {
-            'Cana-de-açúcar': {'proportion': 0.28, 'area_factor': 200, 'productivity': 80},
-            'Bovinos': {'proportion': 0.32, 'area_factor': 150, 'productivity': 2.5},
-            'Citros': {'proportion': 0.15, 'area_factor': 75, 'productivity': 25},
-            'Suínos': {'proportion': 0.15, 'area_factor': 25, 'productivity': 0.8},
-            'Soja': {'proportion': 0.10, 'area_factor': 50, 'productivity': 3.2}
-        }
-    }
-    
-    current_mix = regional_mix.get(radius, regional_mix['30km'])
+    current_mix = REGIONAL_MIX_ARRAYS.get(radius, REGIONAL_MIX_ARRAYS['30km'])
     
-    total_biogas = 0
+    production, biogas, animals_or_area = _biomass_kernel(
+        float(area_ha), float(score_factor),
+        current_mix['area_factors'], current_mix['productivities'],
+        current_mix['yield_factors'], current_mix['biogas_potentials'],
+        current_mix['is_animal']
+    )
     
-    for source, params in current_mix.items():
-        # Calcular área efetiva baseada no score e parâmetros
-        effective_area = area_ha * score_factor * (params['area_factor'] / 100)
-        
-        # Produção baseada na produtividade típica
-        if source in ['Bovinos', 'Suínos']:
-            # Para animais, usar número de cabeças
-            animal_count = effective_area * params['productivity']
-            if source in BIOMASS_SOURCES:
-                source_info = BIOMASS_SOURCES[source]
-                production_year = animal_count * source_info['yield_factor'] * 365  # kg/ano
-                biogas_potential = production_year * source_info['biogas_potential'] / 1000  # Nm³/ano
-                
-                sources_data.append({
-                    'Fonte': source,
-                    'Área/Animais': f"{animal_count:,.0f} cabeças",
-                    'Produção Estimada': f"{production_year/1000:,.1f} t dejetos/ano",
-                    'Potencial Biogás': f"{biogas_potential:,.0f} Nm³/ano",
-                    'Biogás (Nm³)': biogas_potential,
-                    'Resíduos': ", ".join(source_info['residues'])
-                })
-                total_biogas += biogas_potential
-        else:
-            # Para culturas agrícolas
-            production_year = effective_area * params['productivity']  # t/ha/ano
-            if source in BIOMASS_SOURCES:
-                source_info = BIOMASS_SOURCES[source]
-                residue_production = production_year * source_info['yield_factor']
-                biogas_potential = residue_production * source_info['biogas_potential']
-                
-                sources_data.append({
-                    'Fonte': source,
-                    'Área/Animais': f"{effective_area:,.0f} ha",
-                    'Produção Estimada': f"{production_year:,.0f} t/ano",
-                    'Potencial Biogás': f"{biogas_potential:,.0f} Nm³/ano",
-                    'Biogás (Nm³)': biogas_potential,
-                    'Resíduos': ", ".join(source_info['residues'])
-                })
-                total_biogas += biogas_potential
+    sources = list(current_mix['sources'])
+    quantities = [
+        f"{value:,.0f} {'cabeças' if is_animal else 'ha'}"
+        for value, is_animal in zip(animals_or_area, current_mix['is_animal'])
+    ]
+    residues = list(current_mix['residues'])
     
     # Adicionar informação de resíduos urbanos se aplicável
     if radius in ['30km', '50km']:
@@ -851,18 +928,24 @@ def simulate_biomass_sources(biomass_score: float, area_ha: float, radius: str)
         urban_waste = urban_population * 0.5 * 365  # 0.5 kg/pessoa/dia
         urban_biogas = urban_waste * 100  # Nm³/ano
         
+        sources.append('Resíduos Urbanos')
+        quantities.append(f"{urban_population:,.0f} habitantes")
+        residues.append("RSU, RPO, lodo ETE")
+        production = np.append(production, urban_waste / 1000)
+        biogas = np.append(biogas, urban_biogas)
+    
+    # Ordenar por potencial de biogás (decrescente, estável como o sort anterior)
+    order = np.argsort(-biogas, kind='stable')
+    
+    # Valores numéricos brutos; a formatação é feita uma única vez na exibição
+    for i in order:
         sources_data.append({
-            'Fonte': 'Resíduos Urbanos',
-            'Área/Animais': f"{urban_population:,.0f} habitantes",
-            'Produção Estimada': f"{urban_waste/1000:,.0f} t/ano",
-            'Potencial Biogás': f"{urban_biogas:,.0f} Nm³/ano",
-            'Biogás (Nm³)': urban_biogas,
-            'Resíduos': "RSU, RPO, lodo ETE"
+            'Fonte': sources[i],
+            'Área/Animais': quantities[i],
+            'Produção Estimada': float(production[i]),
+            'Biogás (Nm³)': float(biogas[i]),
+            'Resíduos': residues[i]
         })
-        total_biogas += urban_biogas
-    
-    # Ordenar por potencial de biogás
-    sources_data.sort(key=lambda x: x['Biogás (Nm³)'], reverse=True)
     
     return sources_data
 
@@ -876,31 +959,21 @@ def render_detailed_technical_analysis(property_data: Dict[str, Any], radius: st
     biomass_score = property_data.get('biomass_score', 0)
     biogas_col = f'total_biogas_nm3_year_{radius}'
     biogas_potential = property_data.get(biogas_col, property_data.get('total_biogas_nm3_year_30km', 0))
+    plant_capacity_kw = (biogas_potential / 8760) * 10 if biogas_potential > 0 else 0
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("### 📐 Características da Propriedade")
-        st.markdown(f"""
-        - **Área Total**: {area_ha:,.1f} hectares
-        - **Score de Biomassa**: {biomass_score:.1f}/100
-        - **Raio de Captação**: {radius}
-        - **Município**: {property_data.get('municipio', 'N/A')}
-        """)
+        st.markdown(PROPERTY_CHARACTERISTICS_TEMPLATE.format_map({
+            'area_ha': area_ha,
+            'biomass_score': biomass_score,
+            'radius': radius,
+            'municipio': property_data.get('municipio', 'N/A')
+        }))
         
         # Classificação por área
-        if area_ha >= 1000:
-            area_class = "🏭 Grande Propriedade"
-            area_note = "Excelente para plantas industriais"
-        elif area_ha >= 500:
-            area_class = "🏢 Propriedade Média-Grande" 
-            area_note = "Adequada para plantas comerciais"
-        elif area_ha >= 100:
-            area_class = "🏠 Propriedade Média"
-            area_note = "Viável para plantas pequenas"
-        else:
-            area_class = "🏘️ Propriedade Pequena"
-            area_note = "Limitada para biogás comercial"
+        area_class, area_note = AREA_CLASSES[bisect.bisect_right(AREA_THRESHOLDS_HA, area_ha)]
             
         st.info(f"{area_class}: {area_note}")
     
@@ -912,27 +985,26 @@ def render_detailed_technical_analysis(property_data: Dict[str, Any], radius: st
             # Conversões energéticas
             energy_mwh_year = (biogas_potential * 10) / 1000  # 1 Nm³ ≈ 10 kWh
             energy_gj_year = energy_mwh_year * 3.6  # 1 MWh = 3.6 GJ
-            plant_capacity_kw = (biogas_potential / 8760) * 10
             capacity_factor = 0.85  # Fator de capacidade típico
             
-            st.markdown(f"""
-            - **Potencial Energético**: {energy_mwh_year:,.0f} MWh/ano
-            - **Equivalente**: {energy_gj_year:,.0f} GJ/ano
-            - **Capacidade Instalada**: {plant_capacity_kw:,.0f} kW
-            - **Fator de Capacidade**: {capacity_factor:.0%}
-            - **Energia Líquida**: {energy_mwh_year * capacity_factor:,.0f} MWh/ano
-            """)
+            st.markdown(ENERGY_PARAMETERS_TEMPLATE.format_map({
+                'energy_mwh_year': energy_mwh_year,
+                'energy_gj_year': energy_gj_year,
+                'plant_capacity_kw': plant_capacity_kw,
+                'capacity_factor': capacity_factor,
+                'net_energy_mwh_year': energy_mwh_year * capacity_factor
+            }))
             
             # Equivalências energéticas
             st.markdown("#### 🔋 Equivalências Energéticas")
             households_served = energy_mwh_year / 3.5  # 3.5 MWh/casa/ano média
             diesel_liters = energy_mwh_year * 250  # ~250L diesel/MWh
             
-            st.markdown(f"""
-            - **Residências Atendidas**: ~{households_served:,.0f} casas/ano
-            - **Equivalente Diesel**: {diesel_liters:,.0f} litros/ano
-            - **Redução CO₂**: ~{diesel_liters * 2.7 / 1000:,.0f} t CO₂eq/ano
-            """)
+            st.markdown(ENERGY_EQUIVALENCES_TEMPLATE.format_map({
+                'households_served': households_served,
+                'diesel_liters': diesel_liters,
+                'co2_reduction_t': diesel_liters * 2.7 / 1000
+            }))
     
     # Análise de viabilidade técnica
     st.markdown("### 🔧 Avaliação de Viabilidade Técnica")
@@ -940,14 +1012,8 @@ def render_detailed_technical_analysis(property_data: Dict[str, Any], radius: st
     viability_factors = []
     
     # Fator 1: Capacidade mínima
-    if plant_capacity_kw >= 1000:
-        viability_factors.append({"factor": "Capacidade da Planta", "status": "✅", "note": f"{plant_capacity_kw:,.0f} kW - Excelente para viabilidade comercial"})
-    elif plant_capacity_kw >= 500:
-        viability_factors.append({"factor": "Capacidade da Planta", "status": "⚠️", "note": f"{plant_capacity_kw:,.0f} kW - Boa, mas requer análise cuidadosa"})
-    elif plant_capacity_kw >= 250:
-        viability_factors.append({"factor": "Capacidade da Planta", "status": "🔍", "note": f"{plant_capacity_kw:,.0f} kW - Limiar mínimo de viabilidade"})
-    else:
-        viability_factors.append({"factor": "Capacidade da Planta", "status": "❌", "note": f"{plant_capacity_kw:,.0f} kW - Abaixo do mínimo viável (250 kW)"})
+    capacity_status, capacity_note = CAPACITY_VIABILITY[bisect.bisect_right(CAPACITY_THRESHOLDS_KW, plant_capacity_kw)]
+    viability_factors.append({"factor": "Capacidade da Planta", "status": capacity_status, "note": f"{plant_capacity_kw:,.0f} kW - {capacity_note}"})
     
     # Fator 2: Raio logístico
     if radius == '10km':
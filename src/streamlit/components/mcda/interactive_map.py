@@ -3,12 +3,25 @@
 import streamlit as st
 import geopandas as gpd
 import folium
+import numpy as np
+import shapely
+import pyarrow.parquet as pq
 from shapely.geometry import Point
 from streamlit_folium import st_folium
 from typing import Optional, Dict, Any
+import json
 import logging
+import time
 from pathlib import Path
 
+from .data_loader import quantize_geometries, frame_fingerprint, frame_content_hash, SharedAttr, build_code_index, find_property_row
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # --- CONFIGURATION ---
@@ -20,6 +33,27 @@ MAP_CONFIG = {
     'polygon_fill_opacity': 0.6,
 }
 
+# Columns the map actually uses; everything else stays on disk (read via column projection)
+RENDER_COLUMNS = ['geometry', 'mcda_score', 'municipio', 'ranking', 'cod_imovel']
+
+# Score -> color lookup (lower bin edges of Regular, Bom, Muito Bom, Excelente)
+SCORE_COLOR_BINS = np.array([35, 50, 65, 80])
+SCORE_COLORS = np.array(['#FF4444', '#FF8800', '#BBBB00', '#66BB00', '#00AA00'], dtype='<U7')
+
+LEGEND_HTML = """
+     <div style="position: fixed; 
+     bottom: 50px; right: 50px; width: 180px; 
+     background-color: white; border:2px solid grey; z-index:9999; font-size:14px;
+     padding: 10px; border-radius: 8px; box-shadow: 0 0 10px rgba(0,0,0,0.2);">
+     <h4 style='margin-top:0; color: #2c5530;'>Score MCDA</h4>
+     <p style="margin:2px;"><i class="fa fa-square" style="color:#00AA00"></i> 80-100: Excelente</p>
+     <p style="margin:2px;"><i class="fa fa-square" style="color:#66BB00"></i> 65-79: Muito Bom</p>
+     <p style="margin:2px;"><i class="fa fa-square" style="color:#BBBB00"></i> 50-64: Bom</p>
+     <p style="margin:2px;"><i class="fa fa-square" style="color:#FF8800"></i> 35-49: Regular</p>
+     <p style="margin:2px;"><i class="fa fa-square" style="color:#FF4444"></i> 0-34: Baixo</p>
+     </div>
+"""
+
 # --- 1. DATA LOADING (OPTIMIZED) ---
 @st.cache_data
 def load_properties_geoparquet_by_radius(radius: str = '30km') -> gpd.GeoDataFrame:
@@ -50,14 +84,8 @@ def load_properties_geoparquet_by_radius(radius: str = '30km') -> gpd.GeoDataFra
             logger.warning(f"⚠️ {filename} not found. Trying fallback...")
             return load_properties_geoparquet_fallback()
         
-        gdf = gpd.read_parquet(geoparquet_path)
-        gdf = gdf.set_geometry('geometry')
-        
-        # Create spatial index for performance
-        try:
-            gdf.sindex
-        except:
-            logger.warning("Could not create spatial index")
+        gdf = quantize_geometries(read_render_columns(geoparquet_path))
+        build_spatial_index(gdf)
             
         logger.info(f"✅ {len(gdf)} properties loaded from {filename}.")
         return gdf
@@ -77,9 +105,8 @@ def load_properties_geoparquet_fallback() -> gpd.GeoDataFrame:
         streamlit_root = current_file_path.parent.parent.parent
         geoparquet_path = streamlit_root / "CP2B_Processed_Geometries.geoparquet"
         
-        gdf = gpd.read_parquet(geoparquet_path)
-        gdf = gdf.set_geometry('geometry')
-        gdf.sindex
+        gdf = quantize_geometries(read_render_columns(geoparquet_path))
+        build_spatial_index(gdf)
         logger.info(f"✅ {len(gdf)} properties loaded from fallback GeoParquet.")
         return gdf
     except FileNotFoundError:
@@ -99,59 +126,141 @@ def load_properties_geoparquet() -> gpd.GeoDataFrame:
     radius = st.session_state.get('cp2b_selected_radius', '30km')
     return load_properties_geoparquet_by_radius(radius)
 
+def read_render_columns(geoparquet_path: Path) -> gpd.GeoDataFrame:
+    """
+    Reads only RENDER_COLUMNS from a GeoParquet file (pyarrow column projection).
+    MCDA files store the municipality as municipio_x, which is read and renamed instead.
+    """
+    available = pq.read_schema(geoparquet_path).names
+    renames = {'municipio_x': 'municipio'} if 'municipio' not in available else {}
+    columns = [col for col in available if renames.get(col, col) in RENDER_COLUMNS]
+    gdf = gpd.read_parquet(geoparquet_path, columns=columns).rename(columns=renames)
+    if 'municipio' in gdf.columns:
+        # Low-cardinality column: categorical codes make equality/unique/map integer operations
+        gdf['municipio'] = gdf['municipio'].astype('category')
+    return gdf
+
+def build_spatial_index(gdf: gpd.GeoDataFrame) -> None:
+    """
+    Builds the click-detection STRtree once at load and stores it, with the matching
+    cod_imovel array, in gdf.attrs so downstream calls never rebuild it (plus the cod_imovel row index).
+    """
+    if gdf.empty:
+        return
+    # SharedAttr: pandas deep-copies attrs into every derived frame; the tree must be shared, not copied
+    gdf.attrs['_strtree'] = SharedAttr((shapely.STRtree(gdf.geometry.values), gdf['cod_imovel'].to_numpy()))
+    build_code_index(gdf)
+
 # --- 2. MAP CREATION (OPTIMIZED) ---
 def create_optimized_interactive_map(gdf_properties: gpd.GeoDataFrame, max_properties: int = 8000) -> folium.Map:
-    """Creates a visible map using a single, efficient GeoJson layer."""
+    """
+    Creates a visible map using a single, efficient GeoJson layer.
+    The Map is built per render (st_folium mutates it); only the layer GeoJSON is cached.
+    """
     m = folium.Map(location=MAP_CONFIG['center_rmc'], zoom_start=MAP_CONFIG['default_zoom'], tiles='OpenStreetMap')
 
     if gdf_properties.empty:
         return m
 
-    df_display = gdf_properties.sort_values('mcda_score', ascending=False).head(max_properties)
-    logger.info(f"🗺️ Displaying {len(df_display)} top properties on the map.")
-
-    geojson_data = df_display.to_json()
-
     style_function = lambda x: {
-        'fillColor': get_score_color(x['properties']['mcda_score']),
+        'fillColor': x['properties']['_color'],
         'color': '#000000',
         'weight': MAP_CONFIG['polygon_weight'],
         'fillOpacity': MAP_CONFIG['polygon_fill_opacity'],
     }
 
-    folium.GeoJson(
-        geojson_data,
+    layer = folium.GeoJson(
+        build_map_geojson(gdf_properties, max_properties),
         style_function=style_function,
         tooltip=folium.features.GeoJsonTooltip(
-            fields=['municipio', 'mcda_score', 'ranking'],
-            aliases=['Município:', 'Score MCDA:', 'Ranking:'],
+            fields=['_tooltip_html'],
+            aliases=[''],
+            labels=False,
             style=("background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;")
         )
-    ).add_to(m)
+    )
+    layer.add_to(m)
 
     add_legend_to_map(m)
     folium.LayerControl().add_to(m)
     logger.info("✅ Optimized visible map created successfully.")
     return m
 
+@st.cache_data(max_entries=16, hash_funcs={gpd.GeoDataFrame: frame_content_hash})
+def build_map_geojson(gdf_properties: gpd.GeoDataFrame, max_properties: int) -> str:
+    """
+    GeoJSON of the top properties shown on the map.
+    Cached per (property content, max_properties): reruns with unchanged filters skip serialization.
+    """
+    df_display = gdf_properties.sort_values('mcda_score', ascending=False).head(max_properties)
+    logger.info(f"🗺️ Displaying {len(df_display)} top properties on the map.")
+
+    # Tooltip and fill color are precomputed so the GeoJSON only carries what the browser needs
+    df_display = df_display[['cod_imovel', 'geometry']].assign(
+        _color=get_score_colors(df_display['mcda_score'].to_numpy()),
+        _tooltip_html=(
+            '<b>' + df_display['municipio'].astype(str) + '</b>'
+            + '<br>Score MCDA: ' + df_display['mcda_score'].round(1).astype(str)
+            + '<br>Ranking: ' + df_display['ranking'].astype(str)
+        )
+    )
+    return gdf_to_geojson(df_display)
+
+def gdf_to_geojson(gdf: gpd.GeoDataFrame) -> str:
+    """
+    Serializes a GeoDataFrame to a GeoJSON FeatureCollection string.
+    Geometries are encoded in one vectorized shapely.to_geojson call; properties use orjson when installed.
+    """
+    geometries = shapely.to_geojson(np.asarray(gdf.geometry.values))
+    records = gdf.drop(columns=gdf.geometry.name).to_dict('records')
+    if ORJSON_AVAILABLE:
+        dumps = lambda obj: orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    else:
+        dumps = json.dumps
+    features = ','.join(
+        f'{{"type":"Feature","properties":{dumps(properties)},"geometry":{geometry or "null"}}}'
+        for properties, geometry in zip(records, geometries)
+    )
+    return '{"type":"FeatureCollection","features":[' + features + ']}'
+
 # --- 3. CLICK DETECTION (OPTIMIZED) ---
+@st.cache_resource(max_entries=8)
+def build_click_strtree(cache_key: tuple, _geometries: np.ndarray, _cod_imovel: np.ndarray):
+    """Builds (once per property set) the shapely STRtree used for click detection."""
+    return shapely.STRtree(_geometries), _cod_imovel
+
+def get_click_strtree(gdf_properties: gpd.GeoDataFrame):
+    """
+    Returns (tree, cod_imovel array, shared) for click detection.
+    shared=True means the tree came from the loader via gdf.attrs and may hold rows filtered out of this frame.
+    """
+    shared_tree = gdf_properties.attrs.get('_strtree')
+    if shared_tree is not None:
+        tree, tree_cods = shared_tree.value
+        return tree, tree_cods, True
+    tree, tree_cods = build_click_strtree(
+        frame_fingerprint(gdf_properties),
+        np.asarray(gdf_properties.geometry.values),
+        gdf_properties['cod_imovel'].to_numpy()
+    )
+    return tree, tree_cods, False
+
 def detect_clicked_property_optimized(click_lat: float, click_lon: float, gdf_properties: gpd.GeoDataFrame) -> Optional[str]:
-    """Detects clicked property using a fast spatial index."""
-    if gdf_properties.empty or not hasattr(gdf_properties, 'sindex'):
+    """Detects clicked property with a single shapely 2.0 STRtree query."""
+    if gdf_properties.empty or 'cod_imovel' not in gdf_properties.columns:
         return None
         
+    start = time.perf_counter()
     click_point = Point(click_lon, click_lat)
     
-    possible_matches_index = list(gdf_properties.sindex.intersection(click_point.bounds))
-    if not possible_matches_index:
-        return None
-
-    possible_matches = gdf_properties.iloc[possible_matches_index]
-    precise_matches = possible_matches[possible_matches.contains(click_point)]
+    tree, tree_cods, shared = get_click_strtree(gdf_properties)
+    hits = np.sort(tree.query(click_point, predicate='intersects'))
     
-    if not precise_matches.empty:
-        cod_imovel = precise_matches.iloc[0]['cod_imovel']
-        logger.info(f"✅ Click detected on property: {cod_imovel}")
+    for cod_imovel in tree_cods[hits]:
+        # A loader tree travels with filtered copies: only accept rows still in this frame
+        if shared and find_property_row(gdf_properties, cod_imovel) is None:
+            continue
+        logger.info(f"✅ Click detected on property: {cod_imovel} ({(time.perf_counter() - start) * 1000:.1f} ms)")
         return cod_imovel
         
     return None
@@ -184,9 +293,8 @@ def render_interactive_mcda_map(df_properties: gpd.GeoDataFrame, filters: Dict[s
                 clicked_property = detect_clicked_property_optimized(lat, lon, df_properties)
                 
             if clicked_property:
-                prop_info = df_properties[df_properties['cod_imovel'] == clicked_property].iloc[0]
+                prop_info = find_property_row(df_properties, clicked_property)
                 st.success(f"✅ Propriedade selecionada: {prop_info.get('municipio', 'N/A')} (Score: {prop_info.get('mcda_score', 0):.1f})")
-                st.balloons()
             else:
                 st.info("ℹ️ Clique diretamente sobre um polígono colorido para selecionar.")
 
@@ -198,6 +306,10 @@ def render_interactive_mcda_map(df_properties: gpd.GeoDataFrame, filters: Dict[s
         return None
 
 # --- 5. HELPER UTILITIES ---
+def get_score_colors(scores: np.ndarray) -> np.ndarray:
+    """Vectorized get_score_color: maps all scores to colors with one np.digitize call."""
+    return SCORE_COLORS[np.digitize(scores, SCORE_COLOR_BINS)]
+
 def get_score_color(score: float) -> str:
     """Returns color based on MCDA score."""
     if score >= 80: return '#00AA00'
@@ -208,17 +320,4 @@ def get_score_color(score: float) -> str:
 
 def add_legend_to_map(m: folium.Map):
     """Adds a color legend to the map."""
-    legend_html = """
-     <div style="position: fixed; 
-     bottom: 50px; right: 50px; width: 180px; 
-     background-color: white; border:2px solid grey; z-index:9999; font-size:14px;
-     padding: 10px; border-radius: 8px; box-shadow: 0 0 10px rgba(0,0,0,0.2);">
-     <h4 style='margin-top:0; color: #2c5530;'>Score MCDA</h4>
-     <p style="margin:2px;"><i class="fa fa-square" style="color:#00AA00"></i> 80-100: Excelente</p>
-     <p style="margin:2px;"><i class="fa fa-square" style="color:#66BB00"></i> 65-79: Muito Bom</p>
-     <p style="margin:2px;"><i class="fa fa-square" style="color:#BBBB00"></i> 50-64: Bom</p>
-     <p style="margin:2px;"><i class="fa fa-square" style="color:#FF8800"></i> 35-49: Regular</p>
-     <p style="margin:2px;"><i class="fa fa-square" style="color:#FF4444"></i> 0-34: Baixo</p>
-     </div>
-    """
-    m.get_root().html.add_child(folium.Element(legend_html))
\ No newline at end of file
+    m.get_root().html.add_child(folium.Element(LEGEND_HTML))
@@ -3,21 +3,47 @@
 
 import streamlit as st
 import pandas as pd
+import geopandas as gpd
+import numpy as np
 import folium
-import json
-from shapely.geometry import Point, shape
+import shapely
+import pyarrow.parquet as pq
+from shapely.geometry import box
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import st_folium
 from typing import Optional, Dict, Any, List
 import logging
+from pathlib import Path
+
+from .data_loader import frame_content_hash, find_property_row, MCDA_SCENARIOS
+from .interactive_map import get_score_colors
 
 logger = logging.getLogger(__name__)
 
+# Simplificação de vértices (graus) aplicada à exibição em zoom <= SIMPLIFY_MAX_ZOOM
+SIMPLIFY_TOLERANCE = 1e-4
+SIMPLIFY_MAX_ZOOM = 12
+
+# Zoom inicial do mapa (RMC inteira); nele os polígonos com bordas ficam visíveis
+DEFAULT_ZOOM = 10
+
+# Em zoom <= CLUSTER_MAX_ZOOM (só ao afastar além do zoom inicial) os polígonos ficam abaixo
+# de um pixel: exibir centróides agrupados
+CLUSTER_MAX_ZOOM = DEFAULT_ZOOM - 1
+
+# Sidecar de detecção de clique, gerado por preprocess_data.build_click_sidecar (somente leitura aqui)
+PREPROC_PARQUET_TEMPLATE = "CP2B_MCDA_{radius}.preproc.parquet"
+
+# Vista do mapa (zoom e bounds) persistida entre execuções
+VIEWPORT_ZOOM_KEY = 'invisible_map_zoom'
+VIEWPORT_BOUNDS_KEY = 'invisible_map_bounds'
+
 def create_invisible_polygons_map(df_properties: pd.DataFrame,
                                  center: list = None,
-                                 zoom: int = None,
-                                 zoom_bounds: dict = None) -> folium.Map:
+                                 zoom: int = None) -> folium.Map:
     """
     Cria mapa limpo com polígonos invisíveis para detecção de clique
+    O mapa é criado a cada renderização (o st_folium o altera); só o FeatureCollection fica em cache
     
     Args:
         df_properties: DataFrame com propriedades e geometrias
@@ -29,7 +55,7 @@ def create_invisible_polygons_map(df_properties: pd.DataFrame,
     """
     try:
         center = center or [-22.9, -47.1]  # Centro da RMC
-        zoom = zoom or 10
+        zoom = zoom or DEFAULT_ZOOM
         
         # Criar mapa base limpo
         m = folium.Map(
@@ -42,42 +68,33 @@ def create_invisible_polygons_map(df_properties: pd.DataFrame,
             logger.warning("⚠️ Nenhuma propriedade para adicionar")
             return m
         
+        if zoom <= CLUSTER_MAX_ZOOM:
+            # Um único cluster de centróides: O(clusters) nós no DOM em vez de O(N) polígonos
+            centroids = shapely.get_coordinates(shapely.centroid(get_geometry_array(df_properties)))
+            FastMarkerCluster(centroids[:, ::-1].tolist(), name='Propriedades').add_to(m)
+            add_visual_references(m)
+            logger.info(f"✅ Mapa criado com {len(centroids)} centróides agrupados (zoom {zoom})")
+            return m
+        
         logger.info(f"🗺️ Adicionando {len(df_properties)} polígonos com bordas para detecção de clique")
         
-        # Adicionar polígonos com bordas visíveis para todas as propriedades
-        for idx, row in df_properties.iterrows():
-            try:
-                if 'geometry_json' not in row or pd.isna(row['geometry_json']):
-                    continue
-                    
-                geo_json = json.loads(row['geometry_json'])
-                cod_imovel = row.get('cod_imovel', 'N/A')
-                municipio = row.get('municipio', 'N/A')
-                score = row.get('mcda_score', 0)
-                
-                # Criar popup informativo (só aparece no clique)
-                popup_content = create_minimal_popup(row)
-                
-                # Adicionar polígono com BORDAS OTIMIZADAS para performance
-                border_only_polygon = folium.GeoJson(
-                    geo_json,
-                    style_function=lambda feature, score=score: {
-                        'fillColor': 'transparent',      # Preenchimento invisível
-                        'color': get_border_color(score), # Cor da borda baseada no score
-                        'weight': 1,                     # Borda muito fina para performance
-                        'fillOpacity': 0,                # Sem preenchimento
-                        'opacity': 0.4                   # Borda mais transparente para performance
-                    },
-                    popup=folium.Popup(popup_content, max_width=280),
-                    tooltip=None  # Remover tooltip para melhor performance
-                )
-                
-                # Adicionar ao mapa
-                border_only_polygon.add_to(m)
-                
-            except Exception as e:
-                logger.debug(f"Erro ao adicionar polígono com borda {idx}: {str(e)}")
-                continue
+        # Uma única camada GeoJson (FeatureCollection) para todas as propriedades;
+        # em zoom baixo os vértices extras ficam abaixo de um pixel: simplificar só para exibição
+        feature_collection = build_display_feature_collection(
+            df_properties, simplify=zoom <= SIMPLIFY_MAX_ZOOM)
+        
+        folium.GeoJson(
+            feature_collection,
+            style_function=lambda feature: {
+                'fillColor': 'transparent',      # Preenchimento invisível
+                'color': feature['properties']['border_color'], # Cor da borda baseada no score
+                'weight': 1,                     # Borda muito fina para performance
+                'fillOpacity': 0,                # Sem preenchimento
+                'opacity': 0.4                   # Borda mais transparente para performance
+            },
+            popup=folium.GeoJsonPopup(fields=['popup_html'], labels=False, max_width=280),
+            tooltip=None  # Remover tooltip para melhor performance
+        ).add_to(m)
         
         # Adicionar apenas algumas referências visuais importantes
         add_visual_references(m)
@@ -89,6 +106,71 @@ def create_invisible_polygons_map(df_properties: pd.DataFrame,
         logger.error(f"❌ Erro ao criar mapa com polígonos com bordas: {str(e)}")
         return folium.Map(location=center, zoom_start=zoom)
 
+@st.cache_data(max_entries=16, hash_funcs={pd.DataFrame: frame_content_hash, gpd.GeoDataFrame: frame_content_hash})
+def build_display_feature_collection(df_properties: gpd.GeoDataFrame, simplify: bool) -> Dict[str, Any]:
+    """
+    FeatureCollection exibido pelo mapa, em cache por (conteúdo das propriedades, simplificação)
+    
+    Args:
+        df_properties: GeoDataFrame preparado por prepare_invisible_map_data
+        simplify: Simplificar as geometrias (SIMPLIFY_TOLERANCE) antes de serializar
+        
+    Returns:
+        dict: FeatureCollection GeoJSON
+    """
+    if simplify:
+        df_properties = df_properties.set_geometry(
+            shapely.simplify(get_geometry_array(df_properties), SIMPLIFY_TOLERANCE, preserve_topology=True),
+            crs=df_properties.crs
+        )
+    return build_feature_collection(df_properties)
+
+def build_feature_collection(df_properties: gpd.GeoDataFrame) -> Dict[str, Any]:
+    """
+    Monta um único FeatureCollection com as propriedades do mapa
+    
+    Args:
+        df_properties: GeoDataFrame preparado por prepare_invisible_map_data
+        
+    Returns:
+        dict: FeatureCollection GeoJSON
+    """
+    n = len(df_properties)
+    
+    def column_array(column: str, default: Any) -> np.ndarray:
+        if column in df_properties.columns:
+            return df_properties[column].to_numpy()
+        return np.full(n, default, dtype=object)
+    
+    # Colunas extraídas uma vez como arrays; nenhuma Series por linha
+    geom_arr = get_geometry_array(df_properties)
+    cod_arr = column_array('cod_imovel', 'N/A')
+    municipio_arr = column_array('municipio', 'N/A')
+    score_arr = column_array('mcda_score', 0).astype(float)
+    # Cores das bordas calculadas de uma vez (np.digitize) em vez de uma chamada por polígono
+    color_arr = get_score_colors(score_arr)
+    
+    valid = np.flatnonzero(pd.notna(geom_arr))
+    
+    features = []
+    for geom, cod_imovel, municipio, score, color in zip(
+            geom_arr[valid], cod_arr[valid], municipio_arr[valid], score_arr[valid], color_arr[valid]):
+        score = float(score)
+        features.append({
+            'type': 'Feature',
+            'geometry': shapely.geometry.mapping(geom),
+            'properties': {
+                'cod_imovel': cod_imovel,
+                'municipio': municipio,
+                'mcda_score': score,
+                'border_color': str(color),
+                # Popup leve; o relatório completo é renderizado após a detecção do clique
+                'popup_html': f"{municipio}<br>Score: {score:.1f}"
+            }
+        })
+    
+    return {'type': 'FeatureCollection', 'features': features}
+
 def get_border_color(score: float) -> str:
     """Retorna cor da borda baseada no score MCDA"""
     if score >= 80:
@@ -102,64 +184,6 @@ def get_border_color(score: float) -> str:
     else:
         return '#FF4444'  # Vermelho - Baixo
 
-def create_minimal_popup(property_data: pd.Series) -> str:
-    """Cria popup minimalista para polígono invisível"""
-    try:
-        cod_imovel = property_data.get('cod_imovel', 'N/A')
-        municipio = property_data.get('municipio', 'N/A')
-        mcda_score = property_data.get('mcda_score', 0)
-        ranking = property_data.get('ranking', 'N/A')
-        
-        # Cor de fundo baseada no score
-        if mcda_score >= 70:
-            bg_color = '#d4edda'  # Verde claro
-            text_color = '#155724'
-        elif mcda_score >= 50:
-            bg_color = '#fff3cd'  # Amarelo claro
-            text_color = '#856404'
-        else:
-            bg_color = '#f8d7da'  # Vermelho claro
-            text_color = '#721c24'
-        
-        popup_html = f"""
-        <div style='font-family: Arial; max-width: 280px; padding: 15px; 
-                    background: {bg_color}; border-radius: 10px; border: 2px solid {text_color};'>
-            <h3 style='margin: 0 0 10px 0; color: {text_color}; text-align: center;'>
-                🏭 Propriedade SICAR
-            </h3>
-            
-            <div style='text-align: center; margin: 10px 0;'>
-                <div style='font-size: 1.2em; font-weight: bold; color: {text_color};'>
-                    Score MCDA: {mcda_score:.1f}/100
-                </div>
-                <div style='font-size: 0.9em; color: {text_color}; margin-top: 5px;'>
-                    Ranking: #{ranking} | {municipio}
-                </div>
-            </div>
-            
-            <div style='margin: 15px 0; text-align: center; font-size: 0.9em;'>
-                <div style='background: {text_color}; color: white; 
-                           padding: 8px 12px; border-radius: 5px; 
-                           font-weight: bold;'>
-                    ✅ Propriedade Identificada!
-                </div>
-                <div style='margin-top: 8px; font-size: 0.8em; opacity: 0.9;'>
-                    Veja os detalhes abaixo do mapa
-                </div>
-            </div>
-            
-            <div style='font-size: 0.7em; color: {text_color}; text-align: center; opacity: 0.8;'>
-                {cod_imovel[:30]}...
-            </div>
-        </div>
-        """
-        
-        return popup_html
-        
-    except Exception as e:
-        logger.error(f"❌ Erro ao criar popup: {str(e)}")
-        return f"<div>Propriedade: {property_data.get('cod_imovel', 'N/A')}</div>"
-
 def add_visual_references(m: folium.Map) -> None:
     """Adiciona referências visuais importantes ao mapa"""
     try:
@@ -229,8 +253,16 @@ def render_invisible_polygons_map(df_properties: pd.DataFrame,
             st.warning("⚠️ Nenhuma propriedade encontrada")
             return None
             
-        # Aplicar filtros
-        df_filtered = apply_invisible_map_filters(df_properties, filters) if filters else df_properties
+        # Geometrias prontas (parse único e em cache)
+        df_properties = prepare_invisible_map_data(df_properties)
+        
+        # Zoom e bounds da execução anterior: o recorte é calculado antes de montar o mapa
+        last_zoom = st.session_state.get(VIEWPORT_ZOOM_KEY)
+        last_bounds = st.session_state.get(VIEWPORT_BOUNDS_KEY)
+        if last_zoom and last_bounds:
+            df_filtered = apply_zoom_based_filtering(df_properties, last_zoom, last_bounds, filters or {})
+        else:
+            df_filtered = apply_invisible_map_filters(df_properties, filters) if filters else df_properties
         
         st.markdown("### 🗺️ Mapa da Região Metropolitana de Campinas")
         st.markdown("**🎯 Propriedades SICAR mostradas apenas pelas bordas coloridas - clique dentro de qualquer polígono para identificar a propriedade**")
@@ -246,49 +278,35 @@ def render_invisible_polygons_map(df_properties: pd.DataFrame,
             st.info(f"**🏙️ Municípios:** {df_filtered['municipio'].nunique() if 'municipio' in df_filtered.columns else 0}")
         
         # Criar mapa com polígonos invisíveis
-        m = create_invisible_polygons_map(df_filtered)
+        m = create_invisible_polygons_map(
+            df_filtered,
+            center=list(get_bounds_center(last_bounds)) if last_bounds else None,
+            zoom=last_zoom
+        )
         
-        # Renderizar com detecção de clique otimizada e captura do zoom
+        # Renderização única; a vista anterior é mantida via zoom/center do componente
         map_data = st_folium(
             m,
             width=None,
             height=700,
             returned_objects=["last_clicked", "zoom", "bounds"],  # Capturar zoom e bounds
-            key=f"invisible_mcda_map_{len(df_filtered)}"  # Key dinâmica para evitar conflitos
+            zoom=last_zoom,
+            center=get_bounds_center(last_bounds) if last_bounds else None,
+            key="invisible_mcda_map"
         )
         
-        # Aplicar filtro dinâmico baseado no zoom
+        # Persistir a vista para o recorte da próxima execução
         if map_data and map_data.get("zoom") and map_data.get("bounds"):
-            current_zoom = map_data["zoom"]
-            current_bounds = map_data["bounds"]
-            
-            # Recalcular propriedades baseado no zoom se necessário
-            df_zoom_filtered = apply_zoom_based_filtering(
-                df_properties, current_zoom, current_bounds, filters
-            )
-            
-            # Se o número de propriedades mudou significativamente, recarregar o mapa
-            if abs(len(df_zoom_filtered) - len(df_filtered)) > 500:
-                st.info(f"🔄 Ajustando para {len(df_zoom_filtered)} propriedades baseado no zoom {current_zoom}")
-                df_filtered = df_zoom_filtered
-                # Recriar mapa com as novas propriedades
-                m = create_invisible_polygons_map(df_filtered)
-                map_data = st_folium(
-                    m,
-                    width=None,
-                    height=700,
-                    returned_objects=["last_clicked", "zoom", "bounds"],
-                    key=f"invisible_mcda_map_zoom_{len(df_filtered)}_{current_zoom}"
-                )
+            st.session_state[VIEWPORT_ZOOM_KEY] = map_data["zoom"]
+            st.session_state[VIEWPORT_BOUNDS_KEY] = map_data["bounds"]
         
         # Processar cliques
         clicked_property = process_invisible_map_clicks(map_data, df_filtered)
         
         if clicked_property:
             # Mostrar informação da propriedade clicada
-            prop_info = df_filtered[df_filtered['cod_imovel'] == clicked_property]
-            if not prop_info.empty:
-                prop = prop_info.iloc[0]
+            prop = find_property_row(df_filtered, clicked_property)
+            if prop is not None:
                 st.success(f"✅ **Propriedade identificada:** {prop.get('municipio', 'N/A')} | Score: {prop.get('mcda_score', 0):.1f}/100")
                 
                 # Mostrar relatório completo automaticamente
@@ -306,6 +324,11 @@ def render_invisible_polygons_map(df_properties: pd.DataFrame,
         st.error(f"Erro: {str(e)}")
         return None
 
+def get_bounds_center(bounds: Dict[str, Dict[str, float]]) -> tuple:
+    """Centro (lat, lon) dos bounds retornados pelo st_folium"""
+    return ((bounds['_southWest']['lat'] + bounds['_northEast']['lat']) / 2,
+            (bounds['_southWest']['lng'] + bounds['_northEast']['lng']) / 2)
+
 def process_invisible_map_clicks(map_data: dict, df_filtered: pd.DataFrame) -> Optional[str]:
     """Processa cliques no mapa com polígonos invisíveis"""
     try:
@@ -337,43 +360,154 @@ def process_invisible_map_clicks(map_data: dict, df_filtered: pd.DataFrame) -> O
         logger.error(f"❌ Erro ao processar cliques: {str(e)}")
         return None
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
+@st.cache_data
+def _parse_geometry_json(df: pd.DataFrame) -> gpd.GeoDataFrame:
+    """Parseia a coluna geometry_json (vetorizado no GEOS) uma única vez"""
+    return gpd.GeoDataFrame(
+        df.drop(columns=['geometry_json']),
+        geometry=shapely.from_geojson(df['geometry_json'].to_numpy()),
+        crs='EPSG:4326'
+    )
+
+def prepare_invisible_map_data(df: pd.DataFrame) -> gpd.GeoDataFrame:
+    """
+    Normaliza o DataFrame do mapa para um GeoDataFrame com geometrias shapely
+    Geometrias em JSON são parseadas uma vez (em cache), não a cada renderização/clique
+    """
+    if 'geometry_json' in df.columns:
+        return _parse_geometry_json(df.drop(columns=['geometry_shapely'], errors='ignore'))
+    if 'geometry_shapely' in df.columns:
+        return gpd.GeoDataFrame(
+            df.drop(columns=['geometry_shapely']),
+            geometry=df['geometry_shapely'].to_numpy(),
+            crs='EPSG:4326'
+        )
+    return df if isinstance(df, gpd.GeoDataFrame) else gpd.GeoDataFrame(df)
+
+def get_geometry_array(df: gpd.GeoDataFrame) -> np.ndarray:
+    """Retorna as geometrias shapely do GeoDataFrame como array numpy (object)"""
+    return np.asarray(df.geometry.values)
+
+def pack_bounding_boxes(bounds: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Bounding boxes (N, 4) como quatro arrays float32 contíguos (SoA) para o pré-filtro vetorizado.
+    Arredondados para fora, para que o float32 nunca exclua um ponto da borda.
+    """
+    return {
+        'minx': np.nextafter(bounds[:, 0].astype(np.float32), np.float32(-np.inf)),
+        'miny': np.nextafter(bounds[:, 1].astype(np.float32), np.float32(-np.inf)),
+        'maxx': np.nextafter(bounds[:, 2].astype(np.float32), np.float32(np.inf)),
+        'maxy': np.nextafter(bounds[:, 3].astype(np.float32), np.float32(np.inf))
+    }
+
+@st.cache_resource(max_entries=8)
+def build_property_spatial_index(cache_key: int, _geometries: np.ndarray, _cod_imovel: np.ndarray) -> Dict[str, Any]:
+    """
+    Constrói (uma vez por conjunto de propriedades) as estruturas de detecção de clique:
+    bounding boxes em SoA float32 para o pré-filtro vetorizado.
+    A posição nos arrays corresponde à posição em cod_imovel.
+    """
+    return {
+        'geometries': _geometries,
+        'cod_imovel': _cod_imovel,
+        'bbox': pack_bounding_boxes(shapely.bounds(_geometries)),
+        'active': np.ones(len(_cod_imovel), dtype=np.bool_)
+    }
+
+def get_preprocessed_paths(radius: str) -> Dict[str, Path]:
+    """Caminhos do GeoParquet de origem e dos arquivos sidecar de um raio"""
+    streamlit_root = Path(__file__).parent.parent.parent
+    paths = {
+        'source': streamlit_root / MCDA_SCENARIOS[radius],
+        'parquet': streamlit_root / PREPROC_PARQUET_TEMPLATE.format(radius=radius)
+    }
+    return paths
+
+@st.cache_resource(max_entries=3)
+def load_preprocessed_spatial_index(radius: str) -> Optional[Dict[str, Any]]:
+    """
+    Estruturas de detecção de clique para todas as propriedades de um raio, lidas do sidecar
+    (parquet com memory_map). Retorna None se o sidecar não existe ou é mais antigo que o GeoParquet de origem.
+    """
+    if radius not in MCDA_SCENARIOS:
+        return None
+    paths = get_preprocessed_paths(radius)
+    
+    try:
+        if not paths['parquet'].exists():
+            return None
+        if paths['source'].exists() and paths['parquet'].stat().st_mtime < paths['source'].stat().st_mtime:
+            logger.warning(f"⚠️ Sidecar {radius} desatualizado; execute preprocess_data.py")
+            return None
+        
+        table = pq.read_table(paths['parquet'], columns=['geom_wkb', 'minx', 'miny', 'maxx', 'maxy', 'cod_imovel'],
+                              memory_map=True)
+        cod_imovel = table.column('cod_imovel').to_numpy(zero_copy_only=False)
+        lookup = pd.Index(cod_imovel)
+        if not lookup.is_unique:
+            return None
+        bounds = np.column_stack([table.column(name).to_numpy() for name in ('minx', 'miny', 'maxx', 'maxy')])
+        
+        spatial_index = {
+            'geometries': shapely.from_wkb(table.column('geom_wkb').to_numpy(zero_copy_only=False)),
+            'cod_imovel': cod_imovel,
+            'lookup': lookup,
+            'bbox': pack_bounding_boxes(bounds)
+        }
+        logger.info(f"✅ Sidecar pré-processado {radius} carregado: {len(cod_imovel)} propriedades")
+        return spatial_index
+    except Exception as e:
+        logger.warning(f"⚠️ Sidecar pré-processado indisponível para {radius}: {str(e)}")
+        return None
+
+def get_property_spatial_index(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Obtém as estruturas de detecção em cache para o conjunto de propriedades do DataFrame.
+    Usa o sidecar do raio de origem do DataFrame (attrs['mcda_radius']) quando ele cobre todas as linhas,
+    marcando em 'active' apenas as linhas do DataFrame.
+    """
+    radius = df.attrs.get('mcda_radius')
+    shared_index = load_preprocessed_spatial_index(radius) if radius else None
+    if shared_index is not None:
+        positions = shared_index['lookup'].get_indexer(df['cod_imovel'].astype(str))
+        if (positions >= 0).all():
+            active = np.zeros(len(shared_index['cod_imovel']), dtype=np.bool_)
+            active[positions] = True
+            return {**shared_index, 'active': active}
+    
+    cod_imovel = df['cod_imovel'].to_numpy()
+    cache_key = int(pd.util.hash_pandas_object(df['cod_imovel'], index=False).sum())
+    return build_property_spatial_index(cache_key, get_geometry_array(df), cod_imovel)
+
 def detect_property_at_coordinates(click_lat: float, click_lon: float, 
-                                 _df_properties: pd.DataFrame) -> Optional[str]:
+                                 df_properties: pd.DataFrame) -> Optional[str]:
     """
     Detecta propriedade nas coordenadas clicadas
-    Versão ultra-otimizada para performance
+    Pré-filtro por bounding boxes, teste exato (shapely.contains_xy) só nos candidatos
     """
     try:
-        if _df_properties.empty:
+        if df_properties.empty or 'cod_imovel' not in df_properties.columns:
             return None
             
-        click_point = Point(click_lon, click_lat)
-        
-        # Busca otimizada - parar na primeira propriedade encontrada
-        for idx in range(min(len(_df_properties), 2000)):  # Limitar busca
-            try:
-                row = _df_properties.iloc[idx]
-                
-                if 'geometry_shapely' not in row or pd.isna(row['geometry_shapely']):
-                    continue
-                    
-                geometry = row['geometry_shapely']
-                
-                # Verificação rápida do bounding box antes da verificação completa
-                bounds = geometry.bounds  # (minx, miny, maxx, maxy)
-                if (bounds[0] <= click_lon <= bounds[2] and 
-                    bounds[1] <= click_lat <= bounds[3]):
-                    
-                    # Só fazer verificação completa se estiver no bounding box
-                    if geometry.contains(click_point):
-                        cod_imovel = row.get('cod_imovel', None)
-                        return cod_imovel
-                    
-            except Exception:
-                continue  # Pular geometrias problemáticas
+        spatial_index = get_property_spatial_index(df_properties)
+        cod_imovel = spatial_index['cod_imovel']
+        active = spatial_index['active']
+        
+        # Pré-filtro por bounding box (4 comparações vetorizadas), GEOS só nos sobreviventes
+        bbox = spatial_index['bbox']
+        lon = np.float32(click_lon)
+        lat = np.float32(click_lat)
+        candidates = np.flatnonzero(
+            active & (bbox['minx'] <= lon) & (lon <= bbox['maxx']) & (bbox['miny'] <= lat) & (lat <= bbox['maxy'])
+        )
+        if len(candidates) == 0:
+            return None
         
-        return None
+        inside = shapely.contains_xy(spatial_index['geometries'][candidates], click_lon, click_lat)
+        if not inside.any():
+            return None
+            
+        return cod_imovel[candidates[int(inside.argmax())]]
         
     except Exception:
         return None
@@ -387,51 +521,41 @@ def apply_zoom_based_filtering(df: pd.DataFrame, zoom_level: int,
     Zoom alto (15+): Todas as propriedades na área visível
     """
     try:
-        df_filtered = df.copy()
-        
-        # Aplicar filtros básicos primeiro
-        if filters.get('score_min', 0) > 0 and 'mcda_score' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['mcda_score'] >= filters['score_min']]
-            
-        if filters.get('municipality', 'Todos') != 'Todos' and 'municipio' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['municipio'] == filters['municipality']]
+        # Filtros básicos como uma única máscara booleana (sem cópia do DataFrame)
+        mask = get_basic_filter_mask(df, filters)
         
         # Filtro por área visível se bounds estão disponíveis
-        if bounds and 'geometry_shapely' in df_filtered.columns:
+        if bounds and isinstance(df, gpd.GeoDataFrame):
             south = bounds.get('_southWest', {}).get('lat')
             west = bounds.get('_southWest', {}).get('lng') 
             north = bounds.get('_northEast', {}).get('lat')
             east = bounds.get('_northEast', {}).get('lng')
             
             if all([south, west, north, east]):
-                # Filtrar propriedades que intersectam com a área visível
-                def intersects_bounds(geometry):
-                    try:
-                        bounds_geom = geometry.bounds  # (minx, miny, maxx, maxy)
-                        return not (bounds_geom[0] > east or bounds_geom[2] < west or 
-                                  bounds_geom[1] > north or bounds_geom[3] < south)
-                    except:
-                        return False
-                
-                df_filtered = df_filtered[df_filtered['geometry_shapely'].apply(intersects_bounds)]
+                # Propriedades que intersectam a área visível (consulta no STRtree do DataFrame completo,
+                # construído uma vez e reutilizado entre cliques)
+                viewport = box(west, south, east, north)
+                visible = np.zeros(len(df), dtype=bool)
+                visible[df.sindex.query(viewport, predicate='intersects')] = True
+                mask &= visible
+        
+        df_filtered = df.iloc[np.flatnonzero(mask)]
         
         # Aplicar limite baseado no zoom
         if zoom_level <= 10:
             # Zoom muito baixo: máximo 1000 propriedades mais esparsas
-            max_limit = min(1000, len(df_filtered))
-            df_filtered = df_filtered.sample(n=max_limit) if len(df_filtered) > max_limit else df_filtered
+            max_limit = 1000
         elif zoom_level <= 12:
             # Zoom baixo: máximo 2500 propriedades
-            max_limit = min(2500, len(df_filtered))
-            df_filtered = df_filtered.head(max_limit)
+            max_limit = 2500
         elif zoom_level <= 14:
             # Zoom médio: máximo 5000 propriedades
-            max_limit = min(5000, len(df_filtered))
-            df_filtered = df_filtered.head(max_limit)
+            max_limit = 5000
         else:
             # Zoom alto: mostrar todas as propriedades na área (até 8000)
-            max_limit = min(8000, len(df_filtered))
-            df_filtered = df_filtered.head(max_limit)
+            max_limit = 8000
+        
+        df_filtered = sample_along_hilbert_curve(df_filtered, max_limit)
         
         logger.info(f"🔍 Zoom {zoom_level}: {len(df_filtered)} propriedades carregadas")
         return df_filtered
@@ -440,24 +564,39 @@ def apply_zoom_based_filtering(df: pd.DataFrame, zoom_level: int,
         logger.error(f"❌ Erro no filtro por zoom: {str(e)}")
         return df.head(2000)  # Fallback seguro
 
+def sample_along_hilbert_curve(df: gpd.GeoDataFrame, max_limit: int) -> gpd.GeoDataFrame:
+    """
+    Seleciona até max_limit propriedades com passo fixo ao longo da curva de Hilbert:
+    a amostra mantém a cobertura espacial uniforme (ao contrário de head())
+    """
+    if len(df) <= max_limit:
+        return df
+    
+    hilbert_order = np.argsort(df.hilbert_distance().to_numpy(), kind='stable')
+    step = -(-len(df) // max_limit)
+    return df.iloc[np.sort(hilbert_order[::step][:max_limit])]
+
 def apply_invisible_map_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     """Aplica filtros para o mapa invisível"""
     try:
-        df_filtered = df.copy()
-        
-        # Aplicar filtros básicos
-        if filters.get('score_min', 0) > 0 and 'mcda_score' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['mcda_score'] >= filters['score_min']]
-            
-        if filters.get('municipality', 'Todos') != 'Todos' and 'municipio' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['municipio'] == filters['municipality']]
+        mask = get_basic_filter_mask(df, filters)
             
         # Para polígonos com bordas, usar limite conservador para performance
         max_limit = filters.get('max_properties', 2000)  # Limite otimizado para performance
-        df_filtered = df_filtered.head(max_limit)
-            
-        return df_filtered
+        return df.iloc[np.flatnonzero(mask)[:max_limit]]
         
     except Exception as e:
         logger.error(f"❌ Erro ao aplicar filtros: {str(e)}")
-        return df
\ No newline at end of file
+        return df
+
+def get_basic_filter_mask(df: pd.DataFrame, filters: Dict[str, Any]) -> np.ndarray:
+    """Máscara booleana dos filtros de score mínimo e município, composta em numpy"""
+    mask = np.ones(len(df), dtype=bool)
+    
+    if filters.get('score_min', 0) > 0 and 'mcda_score' in df.columns:
+        mask &= df['mcda_score'].to_numpy() >= filters['score_min']
+        
+    if filters.get('municipality', 'Todos') != 'Todos' and 'municipio' in df.columns:
+        mask &= (df['municipio'] == filters['municipality']).to_numpy(dtype=bool)
+        
+    return mask
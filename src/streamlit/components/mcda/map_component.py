@@ -3,14 +3,19 @@
 
 import streamlit as st
 import pandas as pd
+import geopandas as gpd
+import numpy as np
+import shapely
 import folium
-from folium.plugins import MarkerCluster
-import streamlit.components.v1 as components
 from streamlit_folium import st_folium
 import json
+import hashlib
 from typing import Optional, Dict, Any
 import logging
 
+from .data_loader import frame_fingerprint, frame_content_hash
+from .invisible_map import get_bounds_center
+
 logger = logging.getLogger(__name__)
 
 # Configurações do mapa
@@ -21,6 +26,58 @@ MCDA_MAP_CONFIG = {
     'max_properties_display': 1000,  # Limite para performance
 }
 
+# Coordenadas aproximadas dos municípios da RMC (apenas para MVP); padrão: Campinas
+MOCK_COORDS = {
+    'Campinas': [-22.9056, -47.0608],
+    'Americana': [-22.7392, -47.3313],
+    'Sumaré': [-22.8219, -47.2669],
+    'Hortolândia': [-22.8583, -47.2200],
+    'Indaiatuba': [-23.0922, -47.2178],
+    'Santa Bárbara d\'Oeste': [-22.7539, -47.4147],
+    'Nova Odessa': [-22.7856, -47.2950],
+    'Valinhos': [-22.9706, -46.9956],
+    'Vinhedo': [-23.0300, -46.9755],
+    'Itatiba': [-23.0053, -46.8378],
+    'Jaguariúna': [-22.7058, -46.9856],
+    'Pedreira': [-22.7417, -46.9025],
+    'Morungaba': [-22.8756, -46.7944],
+    'Monte Mor': [-22.9456, -47.3106],
+    'Paulínia': [-22.7611, -47.1544],
+    'Cosmópolis': [-22.6458, -47.1917],
+    'Artur Nogueira': [-22.5736, -47.1744],
+    'Engenheiro Coelho': [-22.4856, -47.2133],
+    'Holambra': [-22.6319, -47.0547],
+    'Santo Antônio de Posse': [-22.6089, -46.9178],
+}
+MOCK_DEFAULT_COORDS = [-22.9056, -47.0608]
+# As mesmas coordenadas como Series, para um único .map() sobre a coluna de municípios
+MOCK_LAT = pd.Series({municipio: coords[0] for municipio, coords in MOCK_COORDS.items()})
+MOCK_LON = pd.Series({municipio: coords[1] for municipio, coords in MOCK_COORDS.items()})
+
+# Estilo compartilhado dos popups de propriedade (uma vez por página, não por marcador)
+PROPERTY_POPUP_CSS = """
+<style>
+.cp2b-popup table { font-family: Arial; max-width: 250px; }
+.cp2b-popup th { color: #2c5530; text-align: left; padding-right: 8px; }
+.cp2b-popup td { margin: 5px 0; }
+</style>
+"""
+
+# Bounds do mapa retornados pelo st_folium, usados para recortar os marcadores na próxima execução
+MCDA_VIEWPORT_BOUNDS_KEY = 'mcda_map_bounds'
+MCDA_VIEWPORT_ZOOM_KEY = 'mcda_map_zoom'
+
+# Pirâmide de agregação (estilo supercluster): zoom máximo de cada nível; acima do último, marcadores individuais
+MARKER_PYRAMID_LEVELS = (6, 9, 12)
+
+# Colunas exigidas pelos popups das propriedades (validadas uma vez por camada, não por linha)
+POPUP_REQUIRED_COLUMNS = {'cod_imovel', 'municipio', 'mcda_score', 'ranking'}
+
+# Cores dos marcadores por faixa de score: < 40, 40-60, 60-80, >= 80
+# (índice da cor = searchsorted(MARKER_SCORE_BINS, score, side='right'))
+MARKER_SCORE_BINS = np.array([40.0, 60.0, 80.0])
+MARKER_PALETTE = np.array(['#ff0000', '#ff8000', '#ffff00', '#00ff00'])
+
 def create_mcda_base_map(center: list = None, zoom: int = None) -> folium.Map:
     """
     Cria mapa base para análise MCDA
@@ -35,16 +92,208 @@ def create_mcda_base_map(center: list = None, zoom: int = None) -> folium.Map:
     center = center or MCDA_MAP_CONFIG['center_rmc']
     zoom = zoom or MCDA_MAP_CONFIG['default_zoom']
     
-    # Criar mapa base
+    # Criar mapa base; prefer_canvas desenha todos os CircleMarkers em um único <canvas>
+    # (eles usam o renderer do mapa por padrão) em vez de um elemento SVG por marcador
     m = folium.Map(
         location=center,
         zoom_start=zoom,
-        tiles='OpenStreetMap'
+        tiles='OpenStreetMap',
+        prefer_canvas=True
     )
     
     # Adicionar controle de layers
     folium.LayerControl().add_to(m)
     
+    # Estilo dos popups das propriedades (uma vez no cabeçalho do mapa)
+    m.get_root().header.add_child(folium.Element(PROPERTY_POPUP_CSS))
+    
+    return m
+
+@st.cache_data(max_entries=16, hash_funcs={pd.DataFrame: frame_content_hash, gpd.GeoDataFrame: frame_content_hash})
+def build_marker_records(df_properties: pd.DataFrame, detail_zoom: int) -> tuple:
+    """
+    Features GeoJSON (dicionários simples) dos marcadores: até o último nível da pirâmide, pontos agregados;
+    acima dele, as propriedades individuais
+    Em cache por (conteúdo das propriedades, zoom de detalhe); os objetos folium são criados a cada renderização
+    
+    Returns:
+        tuple: (True se agregados, lista de features)
+    """
+    if detail_zoom <= MARKER_PYRAMID_LEVELS[-1] and not df_properties.empty:
+        level = next(level for level in MARKER_PYRAMID_LEVELS if detail_zoom <= level)
+        return True, aggregated_marker_features(build_marker_pyramid(df_properties)[level])
+    return False, property_marker_features(df_properties)
+
+def add_mcda_markers(parent, df_properties: pd.DataFrame, detail_zoom: int):
+    """Adiciona ao mapa os marcadores de build_marker_records"""
+    aggregated, features = build_marker_records(df_properties, detail_zoom)
+    if aggregated:
+        return add_aggregated_points_layer(parent, features)
+    return add_property_points_layer(parent, features)
+
+@st.cache_data(max_entries=8, hash_funcs={pd.DataFrame: frame_content_hash, gpd.GeoDataFrame: frame_content_hash})
+def build_marker_pyramid(df_properties: pd.DataFrame) -> Dict[int, pd.DataFrame]:
+    """
+    Agrega os marcadores em uma grade por nível de zoom (um ponto por célula, com contagem e score médio)
+    A célula tem 1/4 da largura de um tile no zoom do nível: 360 / 2**(zoom + 2) graus
+    
+    Returns:
+        dict: nível -> DataFrame (lat, lon, count, avg_score)
+    """
+    lats, lons = get_marker_coordinates(df_properties)
+    scores = df_properties['mcda_score'].to_numpy(dtype=float) if 'mcda_score' in df_properties.columns else np.zeros(len(df_properties))
+    points = pd.DataFrame({'lat': lats, 'lon': lons, 'score': scores})
+    
+    pyramid = {}
+    for level in MARKER_PYRAMID_LEVELS:
+        cell_size = 360 / 2 ** (level + 2)
+        pyramid[level] = points.groupby(
+            [np.floor(lats / cell_size).astype(np.int64), np.floor(lons / cell_size).astype(np.int64)], sort=False
+        ).agg(
+            lat=('lat', 'mean'),
+            lon=('lon', 'mean'),
+            count=('score', 'size'),
+            avg_score=('score', 'mean')
+        ).reset_index(drop=True)
+    return pyramid
+
+def aggregated_marker_features(df_cells: pd.DataFrame) -> list:
+    """
+    Features dos pontos agregados de um nível da pirâmide (raio pela contagem, cor pelo score médio)
+    
+    Args:
+        df_cells: Nível da pirâmide (build_marker_pyramid)
+        
+    Returns:
+        list: Features GeoJSON dos pontos agregados
+    """
+    counts = df_cells['count'].to_numpy()
+    avg_scores = df_cells['avg_score'].to_numpy()
+    colors = get_score_colors_vec(avg_scores)
+    radii = 6 + 3 * np.log2(counts)
+    
+    logger.info(f"✅ {int(counts.sum())} propriedades agregadas em {len(df_cells)} pontos")
+    return [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': {
+                'color': color,
+                'radius': radius,
+                'popup': f"<b>{count:,} propriedades</b><br>Score médio: {avg_score:.1f}/100"
+            }
+        }
+        for lat, lon, color, radius, count, avg_score in zip(
+            df_cells['lat'].tolist(), df_cells['lon'].tolist(), colors.tolist(), radii.tolist(),
+            counts.tolist(), avg_scores.tolist())
+    ]
+
+def add_aggregated_points_layer(m: folium.Map, features: list) -> folium.Map:
+    """Adiciona a camada GeoJson dos pontos agregados (aggregated_marker_features)"""
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        name="Propriedades SICAR (agregadas)",
+        marker=folium.CircleMarker(fill=True, fill_opacity=0.7, weight=2),
+        style_function=lambda feature: {
+            'color': feature['properties']['color'],
+            'fillColor': feature['properties']['color'],
+            'radius': feature['properties']['radius']
+        },
+        popup=folium.GeoJsonPopup(fields=['popup'], labels=False, max_width=300)
+    ).add_to(m)
+    return m
+
+def add_aggregated_points_to_map(m: folium.Map, df_cells: pd.DataFrame) -> folium.Map:
+    """
+    Adiciona os pontos agregados de um nível da pirâmide (raio pela contagem, cor pelo score médio)
+    
+    Args:
+        m: Mapa folium base
+        df_cells: Nível da pirâmide (build_marker_pyramid)
+        
+    Returns:
+        folium.Map: Mapa com os pontos agregados
+    """
+    return add_aggregated_points_layer(m, aggregated_marker_features(df_cells))
+
+def property_marker_features(df_properties: pd.DataFrame, max_display: int = None) -> list:
+    """
+    Features dos marcadores das propriedades (pontos clicáveis)
+    
+    Args:
+        df_properties: DataFrame com propriedades
+        max_display: Máximo de propriedades a mostrar
+        
+    Returns:
+        list: Features GeoJSON (vazia se não houver propriedades ou colunas dos popups)
+    """
+    max_display = max_display or MCDA_MAP_CONFIG['max_properties_display']
+    
+    if df_properties.empty:
+        logger.warning("Nenhuma propriedade para exibir no mapa")
+        return []
+        
+    # Validação única do esquema; daqui em diante os campos do popup não precisam de checagem por linha
+    missing = POPUP_REQUIRED_COLUMNS - set(df_properties.columns)
+    if missing:
+        logger.error(f"❌ Colunas ausentes para os popups: {sorted(missing)}")
+        return []
+        
+    # Limitar quantidade para performance
+    df_display = df_properties.head(max_display)
+    
+    # Para MVP, vamos usar pontos simples
+    # TODO: Implementar geometrias reais dos polígonos
+    
+    lats, lons = get_marker_coordinates(df_display)
+    scores = df_display['mcda_score'].fillna(0).to_numpy(dtype=float)
+    colors = get_score_colors_vec(scores)
+    
+    def column(name: str) -> list:
+        # object antes do fillna: 'N/A' não é uma categoria do município categórico
+        return df_display[name].astype(object).fillna('N/A').astype(str).tolist()
+    
+    # Só os campos brutos vão no payload: o GeoJsonPopup monta o HTML no clique
+    return [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': {
+                'color': color,
+                'municipio': municipio,
+                'mcda_score': score,
+                'ranking': ranking,
+                'cod_imovel': cod_imovel
+            }
+        }
+        for lat, lon, color, municipio, score, ranking, cod_imovel in zip(
+            lats.tolist(), lons.tolist(), colors.tolist(), column('municipio'),
+            np.round(scores, 1).tolist(), column('ranking'), column('cod_imovel'))
+    ]
+
+def add_property_points_layer(m: folium.Map, features: list) -> folium.Map:
+    """
+    Adiciona a camada dos marcadores das propriedades (property_marker_features)
+    Uma única camada GeoJson de pontos; o Leaflet cria os círculos a partir do FeatureCollection
+    """
+    if not features:
+        return m
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': features},
+        name="Propriedades SICAR",
+        marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.7, weight=2),
+        style_function=lambda feature: {
+            'color': feature['properties']['color'],
+            'fillColor': feature['properties']['color']
+        },
+        popup=folium.GeoJsonPopup(
+            fields=['municipio', 'mcda_score', 'ranking', 'cod_imovel'],
+            aliases=['Município', 'Score MCDA', 'Ranking', 'Código'],
+            class_name='cp2b-popup',
+            max_width=300
+        )
+    ).add_to(m)
+    logger.info(f"✅ {len(features)} propriedades adicionadas ao mapa")
     return m
 
 def add_properties_to_map(m: folium.Map, df_properties: pd.DataFrame, max_display: int = None) -> folium.Map:
@@ -60,51 +309,7 @@ def add_properties_to_map(m: folium.Map, df_properties: pd.DataFrame, max_displa
         folium.Map: Mapa com propriedades adicionadas
     """
     try:
-        max_display = max_display or MCDA_MAP_CONFIG['max_properties_display']
-        
-        if df_properties.empty:
-            logger.warning("Nenhuma propriedade para exibir no mapa")
-            return m
-            
-        # Limitar quantidade para performance
-        df_display = df_properties.head(max_display)
-        
-        # Criar cluster de marcadores para melhor performance
-        marker_cluster = MarkerCluster(
-            name="Propriedades SICAR",
-            overlay=True,
-            control=True
-        ).add_to(m)
-        
-        # Para MVP, vamos usar pontos simples
-        # TODO: Implementar geometrias reais dos polígonos
-        
-        for idx, property_data in df_display.iterrows():
-            # Por enquanto, usar coordenadas simuladas baseadas no município
-            # TODO: Extrair coordenadas reais das geometrias .geo
-            lat, lon = get_mock_coordinates(property_data.get('municipio', 'Campinas'))
-            
-            # Cor baseada no score MCDA
-            score = property_data.get('mcda_score', 0)
-            color = get_score_color(score)
-            
-            # Criar popup com informações básicas
-            popup_html = create_property_popup(property_data)
-            
-            # Adicionar marcador
-            folium.CircleMarker(
-                location=[lat, lon],
-                radius=6,
-                popup=folium.Popup(popup_html, max_width=300),
-                color=color,
-                fill=True,
-                fillColor=color,
-                fillOpacity=0.7,
-                weight=2
-            ).add_to(marker_cluster)
-            
-        logger.info(f"✅ {len(df_display)} propriedades adicionadas ao mapa")
-        return m
+        return add_property_points_layer(m, property_marker_features(df_properties, max_display))
         
     except Exception as e:
         logger.error(f"❌ Erro ao adicionar propriedades ao mapa: {str(e)}")
@@ -120,109 +325,79 @@ def get_score_color(score: float) -> str:
     Returns:
         str: Código da cor
     """
-    if score >= 80:
-        return '#00ff00'  # Verde - Excelente
-    elif score >= 60:
-        return '#ffff00'  # Amarelo - Bom
-    elif score >= 40:
-        return '#ff8000'  # Laranja - Regular
-    else:
-        return '#ff0000'  # Vermelho - Baixo
+    # Vermelho - Baixo, Laranja - Regular, Amarelo - Bom, Verde - Excelente
+    return str(MARKER_PALETTE[np.searchsorted(MARKER_SCORE_BINS, score, side='right')])
 
-def get_mock_coordinates(municipio: str) -> tuple:
+def get_marker_coordinates(df: pd.DataFrame) -> tuple:
     """
-    Retorna coordenadas simuladas baseadas no município (apenas para MVP)
-    TODO: Substituir por coordenadas reais das geometrias
+    Coordenadas dos marcadores de todas as propriedades
+    Por enquanto, coordenadas simuladas baseadas no município (um único .map() sobre a coluna)
+    TODO: Extrair coordenadas reais das geometrias .geo
+    
+    Returns:
+        tuple: (array de latitudes, array de longitudes)
+    """
+    municipios = df['municipio'] if 'municipio' in df.columns else pd.Series('Campinas', index=df.index)
+    lats = municipios.map(MOCK_LAT).astype(float).fillna(MOCK_DEFAULT_COORDS[0]).to_numpy()
+    lons = municipios.map(MOCK_LON).astype(float).fillna(MOCK_DEFAULT_COORDS[1]).to_numpy()
+    return lats, lons
+
+@st.cache_resource(max_entries=8)
+def build_marker_strtree(cache_key: str, _lats: np.ndarray, _lons: np.ndarray) -> shapely.STRtree:
+    """
+    Constrói (uma vez por sequência de marcadores) o STRtree dos pontos dos marcadores
+    cache_key identifica as coordenadas na ordem das linhas: as posições devolvidas pela consulta indexam o DataFrame
+    """
+    return shapely.STRtree(shapely.points(_lons, _lats))
+
+def cull_to_viewport(df: pd.DataFrame, bounds: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Mantém apenas as propriedades cujos marcadores caem na área visível (consulta no STRtree)
     
     Args:
-        municipio: Nome do município
+        df: DataFrame com propriedades
+        bounds: Bounds retornados pelo st_folium
         
     Returns:
-        tuple: (latitude, longitude)
+        pd.DataFrame: Propriedades visíveis (o DataFrame original se os bounds forem inválidos)
     """
-    # Coordenadas aproximadas dos municípios da RMC
-    mock_coords = {
-        'Campinas': [-22.9056, -47.0608],
-        'Americana': [-22.7392, -47.3313],
-        'Sumaré': [-22.8219, -47.2669],
-        'Hortolândia': [-22.8583, -47.2200],
-        'Indaiatuba': [-23.0922, -47.2178],
-        'Santa Bárbara d\'Oeste': [-22.7539, -47.4147],
-        'Nova Odessa': [-22.7856, -47.2950],
-        'Valinhos': [-22.9706, -46.9956],
-        'Vinhedo': [-23.0300, -46.9755],
-        'Itatiba': [-23.0053, -46.8378],
-        'Jaguariúna': [-22.7058, -46.9856],
-        'Pedreira': [-22.7417, -46.9025],
-        'Morungaba': [-22.8756, -46.7944],
-        'Monte Mor': [-22.9456, -47.3106],
-        'Paulínia': [-22.7611, -47.1544],
-        'Cosmópolis': [-22.6458, -47.1917],
-        'Artur Nogueira': [-22.5736, -47.1744],
-        'Engenheiro Coelho': [-22.4856, -47.2133],
-        'Holambra': [-22.6319, -47.0547],
-        'Santo Antônio de Posse': [-22.6089, -46.9178],
-    }
+    south = bounds.get('_southWest', {}).get('lat')
+    west = bounds.get('_southWest', {}).get('lng')
+    north = bounds.get('_northEast', {}).get('lat')
+    east = bounds.get('_northEast', {}).get('lng')
+    if df.empty or None in (south, west, north, east):
+        return df
     
-    # Retorna coordenadas do município ou coordenadas padrão de Campinas
-    return mock_coords.get(municipio, [-22.9056, -47.0608])
+    lats, lons = get_marker_coordinates(df)
+    tree = build_marker_strtree(hashlib.sha1(lats.tobytes() + lons.tobytes()).hexdigest(), lats, lons)
+    hits = tree.query(shapely.box(west, south, east, north), predicate='intersects')
+    return df.iloc[np.sort(hits)]
 
-def create_property_popup(property_data: Dict[str, Any]) -> str:
+def get_score_colors_vec(scores: np.ndarray) -> np.ndarray:
     """
-    Cria HTML do popup para propriedade
+    Versão vetorizada de get_score_color: cores de todos os scores em uma passada NumPy
     
     Args:
-        property_data: Dados da propriedade
+        scores: Array de scores MCDA (0-100)
         
     Returns:
-        str: HTML do popup
+        np.ndarray: Array com o código da cor de cada score
     """
-    try:
-        cod_imovel = property_data.get('cod_imovel', 'N/A')
-        municipio = property_data.get('municipio', 'N/A')
-        mcda_score = property_data.get('mcda_score', 0)
-        ranking = property_data.get('ranking', 'N/A')
-        
-        popup_html = f"""
-        <div style='font-family: Arial; max-width: 250px;'>
-            <h4 style='margin-bottom: 10px; color: #2c5530;'>
-                🏭 Propriedade SICAR
-            </h4>
-            
-            <p style='margin: 5px 0;'>
-                <strong>Município:</strong> {municipio}
-            </p>
-            
-            <p style='margin: 5px 0;'>
-                <strong>Score MCDA:</strong> 
-                <span style='color: {get_score_color(mcda_score)}; font-weight: bold;'>
-                    {mcda_score:.1f}/100
-                </span>
-            </p>
-            
-            <p style='margin: 5px 0;'>
-                <strong>Ranking:</strong> #{ranking}
-            </p>
-            
-            <div style='margin-top: 10px; text-align: center;'>
-                <button onclick='selectProperty("{cod_imovel}")' 
-                        style='background: #2c5530; color: white; border: none; 
-                               padding: 8px 16px; border-radius: 4px; cursor: pointer;'>
-                    📊 Ver Relatório Completo
-                </button>
-            </div>
-            
-            <p style='font-size: 0.8em; color: #666; margin-top: 8px;'>
-                Código: {cod_imovel[:20]}...
-            </p>
-        </div>
-        """
-        
-        return popup_html
+    return MARKER_PALETTE[np.searchsorted(MARKER_SCORE_BINS, scores, side='right')]
+
+def get_mock_coordinates(municipio: str) -> tuple:
+    """
+    Retorna coordenadas simuladas baseadas no município (apenas para MVP)
+    TODO: Substituir por coordenadas reais das geometrias
+    
+    Args:
+        municipio: Nome do município
         
-    except Exception as e:
-        logger.error(f"❌ Erro ao criar popup: {str(e)}")
-        return f"<div>Propriedade: {property_data.get('cod_imovel', 'N/A')}</div>"
+    Returns:
+        tuple: (latitude, longitude)
+    """
+    # Retorna coordenadas do município ou coordenadas padrão de Campinas
+    return MOCK_COORDS.get(municipio, MOCK_DEFAULT_COORDS)
 
 def render_mcda_map(df_properties: pd.DataFrame, 
                    map_center: list = None,
@@ -245,11 +420,24 @@ def render_mcda_map(df_properties: pd.DataFrame,
             st.warning("⚠️ Nenhuma propriedade encontrada para exibir no mapa")
             return None
             
-        # Criar mapa base
-        m = create_mcda_base_map(center=map_center, zoom=map_zoom)
-        
-        # Adicionar propriedades
-        m = add_properties_to_map(m, df_properties)
+        # Vista da execução anterior: o mapa reabre nela, então só os marcadores dessa área são enviados
+        # ao navegador. Sem vista restaurada, o mapa abre no centro/zoom pedidos com todos os marcadores
+        last_zoom = st.session_state.get(MCDA_VIEWPORT_ZOOM_KEY)
+        last_bounds = st.session_state.get(MCDA_VIEWPORT_BOUNDS_KEY)
+        if last_zoom and last_bounds:
+            df_visible = cull_to_viewport(df_properties, last_bounds)
+            view_center = get_bounds_center(last_bounds)
+            view_zoom = last_zoom
+        else:
+            df_visible = df_properties
+            view_center = map_center
+            view_zoom = map_zoom
+        
+        # Criar mapa base (um por renderização: o st_folium altera o mapa recebido)
+        m = create_mcda_base_map(center=list(view_center) if view_center else None, zoom=view_zoom)
+        
+        # Adicionar propriedades; em zoom baixo, pontos agregados da pirâmide
+        add_mcda_markers(m, df_visible, view_zoom or MCDA_MAP_CONFIG['default_zoom'])
         
         # Adicionar JavaScript para capturar cliques (futuro)
         # TODO: Implementar detecção de cliques em propriedades
@@ -259,9 +447,17 @@ def render_mcda_map(df_properties: pd.DataFrame,
             m, 
             width=None, 
             height=600,
-            returned_objects=["last_clicked"]
+            returned_objects=["last_clicked", "bounds", "zoom"],
+            zoom=view_zoom,
+            center=view_center,
+            key="mcda_map"
         )
         
+        # Persistir a vista (zoom e bounds juntos) para o recorte da próxima execução
+        if map_data and map_data.get("zoom") and map_data.get("bounds"):
+            st.session_state[MCDA_VIEWPORT_ZOOM_KEY] = map_data["zoom"]
+            st.session_state[MCDA_VIEWPORT_BOUNDS_KEY] = map_data["bounds"]
+        
         # TODO: Processar cliques e retornar dados de interação
         interaction_data = None
         
@@ -275,6 +471,21 @@ def render_mcda_map(df_properties: pd.DataFrame,
         st.error(f"Erro ao carregar mapa: {str(e)}")
         return None
 
+@st.cache_data(max_entries=8, hash_funcs={pd.DataFrame: frame_fingerprint, gpd.GeoDataFrame: frame_fingerprint})
+def municipality_options(df_properties: pd.DataFrame) -> list:
+    """
+    Opções do filtro de município ('Todos' + municípios em ordem alfabética)
+    Com município categórico, lidas das categorias (U≈20) em vez de um unique() sobre todas as linhas
+    """
+    if 'municipio' not in df_properties.columns or df_properties.empty:
+        return ['Todos']
+    municipios = df_properties['municipio']
+    if isinstance(municipios.dtype, pd.CategoricalDtype):
+        names = municipios.cat.categories.tolist()
+    else:
+        names = municipios.dropna().unique().tolist()
+    return ['Todos'] + sorted(names)
+
 def render_mcda_map_sidebar(df_properties: pd.DataFrame) -> Dict[str, Any]:
     """
     Renderiza sidebar com controles do mapa MCDA
@@ -310,7 +521,7 @@ def render_mcda_map_sidebar(df_properties: pd.DataFrame) -> Dict[str, Any]:
         )
         
         # Filtro por município
-        municipalities = ['Todos'] + sorted(df_properties['municipio'].unique().tolist()) if 'municipio' in df_properties.columns and not df_properties.empty else ['Todos']
+        municipalities = municipality_options(df_properties)
         
         municipality_filter = st.sidebar.selectbox(
             "Filtrar por Município:",
@@ -369,26 +580,24 @@ def apply_mcda_filters(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFram
         if df.empty:
             return df
             
-        df_filtered = df.copy()
+        # Todos os filtros compõem uma única máscara; o DataFrame é fatiado uma vez no final
+        mask = np.ones(len(df), dtype=bool)
         
         # Filtro por score mínimo
-        if 'score_min' in filters and 'mcda_score' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['mcda_score'] >= filters['score_min']]
+        if 'score_min' in filters and 'mcda_score' in df.columns:
+            mask &= df['mcda_score'].to_numpy() >= filters['score_min']
             
         # Filtro por município
-        if filters.get('municipality', 'Todos') != 'Todos' and 'municipio' in df_filtered.columns:
-            df_filtered = df_filtered[df_filtered['municipio'] == filters['municipality']]
+        if filters.get('municipality', 'Todos') != 'Todos' and 'municipio' in df.columns:
+            mask &= (df['municipio'] == filters['municipality']).to_numpy(dtype=bool)
             
         # Busca por código
-        if filters.get('search_query', '').strip() and 'cod_imovel' in df_filtered.columns:
+        if filters.get('search_query', '').strip() and 'cod_imovel' in df.columns:
             search_term = filters['search_query'].strip().lower()
-            df_filtered = df_filtered[
-                df_filtered['cod_imovel'].str.lower().str.contains(search_term, na=False)
-            ]
+            mask &= df['cod_imovel'].str.lower().str.contains(search_term, na=False, regex=False).to_numpy(dtype=bool)
             
         # Limite máximo
-        if 'max_properties' in filters:
-            df_filtered = df_filtered.head(filters['max_properties'])
+        df_filtered = df.iloc[np.flatnonzero(mask)[:filters.get('max_properties', len(df))]]
             
         logger.info(f"✅ Filtros aplicados: {len(df_filtered)} propriedades restantes")
         return df_filtered
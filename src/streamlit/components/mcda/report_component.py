@@ -2,23 +2,80 @@
 # Componente para gerar relatórios básicos das propriedades MCDA
 
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from typing import Dict, Any, Optional
+import numpy as np
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
 import logging
 from datetime import datetime
+from bisect import bisect_right
+
+# Plotly é importado dentro dos construtores de gráficos: quem só importa este módulo não paga o import
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Importar gerador PDF
 try:
     from .pdf_generator import generate_mcda_pdf_report, create_pdf_download_button
     PDF_AVAILABLE = True
 except ImportError as e:
-    logging.warning(f"PDF generator não disponível: {str(e)}")
+    logging.warning("PDF generator não disponível: %s", e)
     PDF_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Culturas (raio 10km) e infraestruturas exibidas no relatório: (rótulo, chave em property_data)
+BIOMASS_MAPPING = (
+    ('Pastagem', 'pasture_ha_10km'),
+    ('Cana-de-açúcar', 'sugarcane_ha_10km'),
+    ('Soja', 'soy_ha_10km'),
+    ('Café', 'coffee_ha_10km'),
+    ('Citros', 'citrus_ha_10km'),
+    ('Outras Temporárias', 'other_temp_ha_10km')
+)
+
+INFRA_MAPPING = (
+    ('Subestações', 'dist_subestacoes_km'),
+    ('Rodovias Federais', 'dist_rodovias_federais_km'),
+    ('Rodovias Estaduais', 'dist_rodovias_estaduais_km'),
+    ('Gasodutos', 'dist_gasodutos_km'),
+    ('Linhas Transmissão', 'dist_linhas_transmissao_km')
+)
+
+# Rótulos e chaves em arrays paralelos para a extração com máscara NumPy
+BIOMASS_LABELS = np.array([label for label, _ in BIOMASS_MAPPING])
+BIOMASS_KEYS = tuple(key for _, key in BIOMASS_MAPPING)
+INFRA_LABELS = np.array([label for label, _ in INFRA_MAPPING])
+INFRA_KEYS = tuple(key for _, key in INFRA_MAPPING)
+
+# Layout comum dos gráficos do relatório, registrado uma vez (no primeiro gráfico) e aplicado por nome
+# (eixo radial do radar em 0-100, rótulos inclinados do gráfico de barras); "plotly+" mantém o tema padrão
+REPORT_TEMPLATE_NAME = 'cp2b_report'
+REPORT_TEMPLATE = 'plotly+cp2b_report'
+
+# Faixas de classificação (limites inferiores em ordem crescente, consultados com bisect_right)
+SCORE_BAND_THRESHOLDS = (40, 60, 80)
+SCORE_BAND_LABELS = ("🔴 Baixo", "🟠 Regular", "🟡 Bom", "🟢 Excelente")
+
+RESTRICTION_STATUS_THRESHOLDS = (3, 7)
+RESTRICTION_STATUS_LABELS = ("Baixa", "Média", "Alta")
+
+DISTANCE_STATUS_THRESHOLDS = (5, 15, 30)
+DISTANCE_STATUS_LABELS = ("🟢 Excelente", "🟡 Boa", "🟠 Regular", "🔴 Distante")
+
+# Interpretação: componente < 30 é ponto de atenção, >= 70 é ponto forte (textos por componente)
+COMPONENT_BAND_THRESHOLDS = (30, 70)
+COMPONENT_INTERPRETATIONS = (
+    ("baixa disponibilidade de biomassa", "excelente disponibilidade de biomassa"),
+    ("infraestrutura distante", "boa acessibilidade à infraestrutura"),
+    ("muitas restrições ambientais", "poucas restrições ambientais")
+)
+
+RECOMMENDATION_THRESHOLDS = (50, 70)
+RECOMMENDATION_TEXTS = (
+    "❌ Não recomendada devido aos desafios identificados.",
+    "⚠️ Viável com estudos adicionais e planejamento cuidadoso.",
+    "✅ Recomendada para desenvolvimento de planta de biogás."
+)
+
 def render_property_report_page(property_data: Dict[str, Any]) -> None:
     """
     Renderiza página completa de relatório da propriedade
@@ -52,10 +109,10 @@ def render_property_report_page(property_data: Dict[str, Any]) -> None:
         # Botões de ação
         render_report_actions(property_data)
         
-        logger.info(f"✅ Relatório renderizado para propriedade {property_data.get('cod_imovel', 'N/A')}")
+        logger.info("✅ Relatório renderizado para propriedade %s", property_data.get('cod_imovel', 'N/A'))
         
     except Exception as e:
-        logger.error(f"❌ Erro ao renderizar relatório: {str(e)}")
+        logger.error("❌ Erro ao renderizar relatório: %s", e)
         st.error(f"Erro ao gerar relatório: {str(e)}")
 
 def render_report_header(property_data: Dict[str, Any]) -> None:
@@ -64,10 +121,13 @@ def render_report_header(property_data: Dict[str, Any]) -> None:
     col1, col2 = st.columns([3, 1])
     
     with col1:
-        st.markdown("# 📊 Relatório MCDA - Análise de Viabilidade")
-        st.markdown(f"### 🏭 Propriedade SICAR")
-        st.markdown(f"**Município:** {property_data.get('municipio', 'N/A')}")
-        st.markdown(f"**Código:** `{property_data.get('cod_imovel', 'N/A')}`")
+        # Um único elemento markdown para título e identificação da propriedade
+        st.markdown(
+            "# 📊 Relatório MCDA - Análise de Viabilidade\n\n"
+            "### 🏭 Propriedade SICAR\n\n"
+            f"**Município:** {property_data.get('municipio', 'N/A')}\n\n"
+            f"**Código:** `{property_data.get('cod_imovel', 'N/A')}`"
+        )
         
     with col2:
         # Botão voltar
@@ -117,7 +177,7 @@ def render_main_metrics(property_data: Dict[str, Any]) -> None:
         
     with col4:
         restriction_score = property_data.get('restriction_score', 0)
-        restriction_status = "Baixa" if restriction_score < 3 else "Média" if restriction_score < 7 else "Alta"
+        restriction_status = RESTRICTION_STATUS_LABELS[bisect_right(RESTRICTION_STATUS_THRESHOLDS, restriction_score)]
         st.metric(
             "Restrições Ambientais",
             restriction_status,
@@ -134,10 +194,14 @@ def render_mcda_analysis(property_data: Dict[str, Any]) -> None:
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        # Criar gráfico radar
-        fig = create_mcda_radar_chart(property_data)
+        # Criar gráfico radar (em cache pelos três scores normalizados)
+        fig = create_mcda_radar_chart(
+            property_data.get('biomass_norm', 0),
+            property_data.get('infra_norm', 0),
+            property_data.get('restriction_norm', 0)
+        )
         if fig:
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, width="stretch")
     
     with col2:
         st.markdown("### Componentes do Score")
@@ -147,9 +211,15 @@ def render_mcda_analysis(property_data: Dict[str, Any]) -> None:
         infra_norm = property_data.get('infra_norm', 0)
         restriction_norm = property_data.get('restriction_norm', 0)
         
-        st.progress(biomass_norm / 100, text=f"Biomassa: {biomass_norm:.1f}/100")
-        st.progress(infra_norm / 100, text=f"Infraestrutura: {infra_norm:.1f}/100")
-        st.progress(restriction_norm / 100, text=f"Restrições: {restriction_norm:.1f}/100")
+        # Três barras estáticas em um único elemento HTML (em vez de três st.progress)
+        st.markdown(
+            score_bars_html((
+                ("Biomassa", biomass_norm),
+                ("Infraestrutura", infra_norm),
+                ("Restrições", restriction_norm)
+            )),
+            unsafe_allow_html=True
+        )
         
         # Interpretação
         st.markdown("### 📋 Interpretação")
@@ -159,65 +229,58 @@ def render_mcda_analysis(property_data: Dict[str, Any]) -> None:
 def render_biomass_analysis(property_data: Dict[str, Any]) -> None:
     """Renderiza análise de biomassa"""
     
+    # Criar dados de biomassa por cultura; sem biomassa, a seção inteira é omitida
+    biomass_data = extract_biomass_data(property_data)
+    if not biomass_data:
+        return
+    
     st.markdown("---")
     st.markdown("## 🌾 Análise de Biomassa Disponível")
     
-    # Criar dados de biomassa por cultura
-    biomass_data = extract_biomass_data(property_data)
+    col1, col2 = st.columns(2)
     
-    if biomass_data:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Gráfico de pizza da biomassa
-            fig_pie = create_biomass_pie_chart(biomass_data)
-            if fig_pie:
-                st.plotly_chart(fig_pie, use_container_width=True)
-        
-        with col2:
-            # Tabela detalhada
-            st.markdown("### Detalhamento por Cultura")
-            df_biomass = pd.DataFrame(list(biomass_data.items()), columns=['Cultura', 'Hectares'])
-            df_biomass = df_biomass[df_biomass['Hectares'] > 0].sort_values('Hectares', ascending=False)
-            
-            if not df_biomass.empty:
-                st.dataframe(df_biomass, use_container_width=True, hide_index=True)
-            else:
-                st.info("Nenhuma biomassa significativa identificada no raio de análise")
+    with col1:
+        # Gráfico de pizza da biomassa
+        fig_pie = create_biomass_pie_chart(tuple(biomass_data.items()))
+        if fig_pie:
+            st.plotly_chart(fig_pie, width="stretch")
+    
+    with col2:
+        # Tabela detalhada
+        st.markdown("### Detalhamento por Cultura")
+        # Poucas linhas já filtradas (> 0): ordenar a lista direto, sem montar um DataFrame
+        biomass_rows = [
+            {'Cultura': culture, 'Hectares': hectares}
+            for culture, hectares in sorted(biomass_data.items(), key=lambda item: item[1], reverse=True)
+        ]
+        st.dataframe(biomass_rows, width="stretch", hide_index=True)
 
 def render_infrastructure_analysis(property_data: Dict[str, Any]) -> None:
     """Renderiza análise de infraestrutura"""
     
+    # Distâncias para infraestruturas; sem distâncias, a seção inteira é omitida
+    infra_data = extract_infrastructure_data(property_data)
+    if not infra_data:
+        return
+    
     st.markdown("---")
     st.markdown("## 🏗️ Análise de Infraestrutura e Logística")
     
-    # Distâncias para infraestruturas
-    infra_data = extract_infrastructure_data(property_data)
+    col1, col2 = st.columns(2)
     
-    if infra_data:
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Gráfico de barras das distâncias
-            fig_bar = create_infrastructure_bar_chart(infra_data)
-            if fig_bar:
-                st.plotly_chart(fig_bar, use_container_width=True)
+    with col1:
+        # Gráfico de barras das distâncias
+        fig_bar = create_infrastructure_bar_chart(tuple(infra_data.items()))
+        if fig_bar:
+            st.plotly_chart(fig_bar, width="stretch")
+    
+    with col2:
+        st.markdown("### 📊 Distâncias (km)")
         
-        with col2:
-            st.markdown("### 📊 Distâncias (km)")
-            
-            for infra_type, distance in infra_data.items():
-                # Classificação da distância
-                if distance < 5:
-                    status = "🟢 Excelente"
-                elif distance < 15:
-                    status = "🟡 Boa"
-                elif distance < 30:
-                    status = "🟠 Regular"
-                else:
-                    status = "🔴 Distante"
-                    
-                st.metric(infra_type, f"{distance:.1f} km", delta=None, help=status)
+        for infra_type, distance in infra_data.items():
+            # Classificação da distância
+            status = DISTANCE_STATUS_LABELS[bisect_right(DISTANCE_STATUS_THRESHOLDS, distance)]
+            st.metric(infra_type, f"{distance:.1f} km", delta=None, help=status)
 
 def render_restrictions_analysis(property_data: Dict[str, Any]) -> None:
     """Renderiza análise de restrições"""
@@ -225,7 +288,12 @@ def render_restrictions_analysis(property_data: Dict[str, Any]) -> None:
     st.markdown("---")
     st.markdown("## ⚠️ Análise de Restrições Ambientais")
     
-    restriction_score = property_data.get('restriction_score', 0)
+    restriction_score = property_data.get('restriction_score')
+    
+    # Sem dado de restrições: só o aviso, sem gauge nem colunas
+    if restriction_score is None:
+        st.info("ℹ️ Dados de restrições ambientais não disponíveis para esta propriedade")
+        return
     
     col1, col2 = st.columns(2)
     
@@ -233,7 +301,7 @@ def render_restrictions_analysis(property_data: Dict[str, Any]) -> None:
         # Indicador visual do score de restrições
         fig_gauge = create_restriction_gauge(restriction_score)
         if fig_gauge:
-            st.plotly_chart(fig_gauge, use_container_width=True)
+            st.plotly_chart(fig_gauge, width="stretch")
     
     with col2:
         st.markdown("### 📋 Interpretação das Restrições")
@@ -248,13 +316,19 @@ def render_restrictions_analysis(property_data: Dict[str, Any]) -> None:
             st.error("🚫 **Restrições altas** - Desenvolvimento não recomendado")
         
         # Detalhamento das restrições (se disponível)
-        st.markdown("**Possíveis restrições consideradas:**")
-        st.markdown("- Unidades de Conservação de Proteção Integral")
-        st.markdown("- Unidades de Conservação de Uso Sustentável")
-        st.markdown("- Perímetros Urbanos (buffer de 1km para ruído/odor)")
+        st.markdown(
+            "**Possíveis restrições consideradas:**\n"
+            "- Unidades de Conservação de Proteção Integral\n"
+            "- Unidades de Conservação de Uso Sustentável\n"
+            "- Perímetros Urbanos (buffer de 1km para ruído/odor)"
+        )
 
+@st.fragment
 def render_report_actions(property_data: Dict[str, Any]) -> None:
-    """Renderiza botões de ação do relatório"""
+    """
+    Renderiza botões de ação do relatório
+    Fragmento: os cliques (Gerar PDF, Copiar, Comparar) reexecutam só esta seção, não os gráficos e tabelas acima
+    """
     
     st.markdown("---")
     st.markdown("## 📤 Ações do Relatório")
@@ -283,41 +357,67 @@ def render_report_actions(property_data: Dict[str, Any]) -> None:
             if st.button("📄 Gerar PDF", width="stretch"):
                 try:
                     with st.spinner("📄 Gerando relatório PDF..."):
-                        pdf_content = generate_mcda_pdf_report(property_data)
+                        pdf_content, report_time = generate_mcda_pdf_report(property_data)
                         st.success("✅ PDF gerado com sucesso!")
                         
                     # Exibir botão de download
                     st.markdown("### 📥 Download do Relatório")
-                    create_pdf_download_button(pdf_content, property_data)
+                    create_pdf_download_button(pdf_content, property_data, report_time)
                         
                 except Exception as e:
                     st.error(f"❌ Erro ao gerar PDF: {str(e)}")
-                    logger.error(f"Erro na geração PDF: {str(e)}")
+                    logger.error("Erro na geração PDF: %s", e)
         else:
             if st.button("📄 Exportar PDF", width="stretch"):
                 st.warning("⚠️ ReportLab não instalado. Execute: pip install reportlab")
 
 # Funções auxiliares
 
+def score_bars_html(components: Tuple[Tuple[str, float], ...]) -> str:
+    """Monta barras horizontais (0-100) com rótulo e valor, como HTML estático"""
+    bars = []
+    for label, value in components:
+        width = min(max(value, 0), 100)
+        bars.append(
+            f'<div style="margin-bottom: 0.75rem;">'
+            f'<div style="font-size: 0.9rem; margin-bottom: 0.25rem;">{label}: {value:.1f}/100</div>'
+            f'<div style="background-color: #e2e8f0; border-radius: 4px; height: 8px;">'
+            f'<div style="width: {width:.1f}%; background-color: #2c5530; border-radius: 4px; height: 100%;"></div>'
+            f'</div></div>'
+        )
+    return "".join(bars)
+
 def get_score_color_name(score: float) -> str:
     """Retorna nome da classificação baseada no score"""
-    if score >= 80:
-        return "🟢 Excelente"
-    elif score >= 60:
-        return "🟡 Bom"
-    elif score >= 40:
-        return "🟠 Regular"
-    else:
-        return "🔴 Baixo"
-
-def create_mcda_radar_chart(property_data: Dict[str, Any]) -> Optional[go.Figure]:
+    return SCORE_BAND_LABELS[bisect_right(SCORE_BAND_THRESHOLDS, score)]
+
+# Os construtores de gráficos recebem apenas escalares/tuplas para que o st.cache_data
+# reaproveite a figura nos reruns em que a propriedade não mudou
+
+def get_report_template() -> str:
+    """Registra o template dos gráficos do relatório na primeira chamada e devolve o nome a usar"""
+    import plotly.io as pio
+    
+    if REPORT_TEMPLATE_NAME not in pio.templates:
+        import plotly.graph_objects as go
+        pio.templates[REPORT_TEMPLATE_NAME] = go.layout.Template(layout=go.Layout(
+            polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+            xaxis=dict(tickangle=-45)
+        ))
+    return REPORT_TEMPLATE
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_mcda_radar_chart(biomass_norm: float, infra_norm: float, restriction_norm: float) -> Optional["go.Figure"]:
     """Cria gráfico radar dos componentes MCDA"""
+    import plotly.graph_objects as go
+    
     try:
-        biomass_norm = property_data.get('biomass_norm', 0)
-        infra_norm = property_data.get('infra_norm', 0)
-        restriction_norm = property_data.get('restriction_norm', 0)
-        
-        fig = go.Figure()
+        fig = go.Figure(layout=dict(
+            template=get_report_template(),
+            showlegend=False,
+            title="Componentes do Score MCDA",
+            height=400
+        ))
         
         fig.add_trace(go.Scatterpolar(
             r=[biomass_norm, infra_norm, restriction_norm],
@@ -327,102 +427,84 @@ def create_mcda_radar_chart(property_data: Dict[str, Any]) -> Optional[go.Figure
             line=dict(color='#2c5530')
         ))
         
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 100]
-                )),
-            showlegend=False,
-            title="Componentes do Score MCDA",
-            height=400
-        )
-        
         return fig
     except Exception as e:
-        logger.error(f"❌ Erro ao criar gráfico radar: {str(e)}")
+        logger.error("❌ Erro ao criar gráfico radar: %s", e)
         return None
 
+def extract_positive_values(property_data: Dict[str, Any], keys: Tuple[str, ...], labels: np.ndarray) -> Dict[str, float]:
+    """
+    Lê as chaves de uma vez em um array e filtra os valores positivos com uma máscara
+    Aceita dict ou pd.Series (ambos têm .get); chaves ausentes valem 0 e NaN é descartado
+    """
+    values = np.fromiter((property_data.get(key, 0) for key in keys), dtype=np.float64, count=len(keys))
+    mask = values > 0
+    return dict(zip(labels[mask].tolist(), values[mask].tolist()))
+
 def extract_biomass_data(property_data: Dict[str, Any]) -> Dict[str, float]:
-    """Extrai dados de biomassa por cultura"""
-    biomass_mapping = {
-        'Pastagem': 'pasture_ha_10km',
-        'Cana-de-açúcar': 'sugarcane_ha_10km',
-        'Soja': 'soy_ha_10km',
-        'Café': 'coffee_ha_10km',
-        'Citros': 'citrus_ha_10km',
-        'Outras Temporárias': 'other_temp_ha_10km'
-    }
-    
-    biomass_data = {}
-    for culture, key in biomass_mapping.items():
-        value = property_data.get(key, 0)
-        if value > 0:
-            biomass_data[culture] = value
-            
-    return biomass_data
+    """Extrai dados de biomassa por cultura (apenas culturas com área > 0)"""
+    return extract_positive_values(property_data, BIOMASS_KEYS, BIOMASS_LABELS)
 
-def create_biomass_pie_chart(biomass_data: Dict[str, float]) -> Optional[go.Figure]:
-    """Cria gráfico de pizza da biomassa"""
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_biomass_pie_chart(biomass_items: Tuple[Tuple[str, float], ...]) -> Optional["go.Figure"]:
+    """Cria gráfico de pizza da biomassa a partir dos pares (cultura, hectares)"""
+    import plotly.express as px
+    
     try:
-        if not biomass_data:
+        if not biomass_items:
             return None
             
+        names, values = zip(*biomass_items)
         fig = px.pie(
-            values=list(biomass_data.values()),
-            names=list(biomass_data.keys()),
-            title="Distribuição da Biomassa por Cultura"
+            values=list(values),
+            names=list(names),
+            title="Distribuição da Biomassa por Cultura",
+            template=get_report_template()
         )
         
         fig.update_traces(textposition='inside', textinfo='percent+label')
         return fig
         
     except Exception as e:
-        logger.error(f"❌ Erro ao criar gráfico de pizza: {str(e)}")
+        logger.error("❌ Erro ao criar gráfico de pizza: %s", e)
         return None
 
 def extract_infrastructure_data(property_data: Dict[str, Any]) -> Dict[str, float]:
-    """Extrai dados de infraestrutura"""
-    infra_mapping = {
-        'Subestações': 'dist_subestacoes_km',
-        'Rodovias Federais': 'dist_rodovias_federais_km',
-        'Rodovias Estaduais': 'dist_rodovias_estaduais_km',
-        'Gasodutos': 'dist_gasodutos_km',
-        'Linhas Transmissão': 'dist_linhas_transmissao_km'
-    }
-    
-    infra_data = {}
-    for infra_type, key in infra_mapping.items():
-        value = property_data.get(key, 0)
-        if value > 0:
-            infra_data[infra_type] = value
-            
-    return infra_data
+    """Extrai dados de infraestrutura (apenas distâncias > 0)"""
+    return extract_positive_values(property_data, INFRA_KEYS, INFRA_LABELS)
 
-def create_infrastructure_bar_chart(infra_data: Dict[str, float]) -> Optional[go.Figure]:
-    """Cria gráfico de barras da infraestrutura"""
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_infrastructure_bar_chart(infra_items: Tuple[Tuple[str, float], ...]) -> Optional["go.Figure"]:
+    """Cria gráfico de barras da infraestrutura a partir dos pares (tipo, distância)"""
+    import plotly.express as px
+    
     try:
-        if not infra_data:
+        if not infra_items:
             return None
             
+        names, distances = zip(*infra_items)
         fig = px.bar(
-            x=list(infra_data.keys()),
-            y=list(infra_data.values()),
+            x=list(names),
+            y=list(distances),
             title="Distâncias para Infraestrutura",
-            labels={'x': 'Tipo de Infraestrutura', 'y': 'Distância (km)'}
+            labels={'x': 'Tipo de Infraestrutura', 'y': 'Distância (km)'},
+            template=get_report_template()
         )
         
-        fig.update_layout(xaxis_tickangle=-45)
         return fig
         
     except Exception as e:
-        logger.error(f"❌ Erro ao criar gráfico de barras: {str(e)}")
+        logger.error("❌ Erro ao criar gráfico de barras: %s", e)
         return None
 
-def create_restriction_gauge(restriction_score: float) -> Optional[go.Figure]:
+@st.cache_data(max_entries=128, show_spinner=False)
+def create_restriction_gauge(restriction_score: float) -> Optional["go.Figure"]:
     """Cria indicador gauge para restrições"""
+    import plotly.graph_objects as go
+    
     try:
-        fig = go.Figure(go.Indicator(
+        fig = go.Figure(layout=dict(template=get_report_template(), height=300))
+        fig.add_trace(go.Indicator(
             mode = "gauge+number",
             value = restriction_score,
             domain = {'x': [0, 1], 'y': [0, 1]},
@@ -443,11 +525,10 @@ def create_restriction_gauge(restriction_score: float) -> Optional[go.Figure]:
             }
         ))
         
-        fig.update_layout(height=300)
         return fig
         
     except Exception as e:
-        logger.error(f"❌ Erro ao criar gauge: {str(e)}")
+        logger.error("❌ Erro ao criar gauge: %s", e)
         return None
 
 def generate_mcda_interpretation(property_data: Dict[str, Any]) -> str:
@@ -457,40 +538,27 @@ def generate_mcda_interpretation(property_data: Dict[str, Any]) -> str:
     infra_norm = property_data.get('infra_norm', 0)
     restriction_norm = property_data.get('restriction_norm', 0)
     
-    # Identificar pontos fortes e fracos
+    # Identificar pontos fortes e fracos (faixa 0: atenção, 1: neutro, 2: forte)
     strengths = []
     weaknesses = []
     
-    if biomass_norm >= 70:
-        strengths.append("excelente disponibilidade de biomassa")
-    elif biomass_norm < 30:
-        weaknesses.append("baixa disponibilidade de biomassa")
-        
-    if infra_norm >= 70:
-        strengths.append("boa acessibilidade à infraestrutura")
-    elif infra_norm < 30:
-        weaknesses.append("infraestrutura distante")
-        
-    if restriction_norm >= 70:
-        strengths.append("poucas restrições ambientais")
-    elif restriction_norm < 30:
-        weaknesses.append("muitas restrições ambientais")
+    for value, (weak_text, strong_text) in zip((biomass_norm, infra_norm, restriction_norm), COMPONENT_INTERPRETATIONS):
+        band = bisect_right(COMPONENT_BAND_THRESHOLDS, value)
+        if band == 2:
+            strengths.append(strong_text)
+        elif band == 0:
+            weaknesses.append(weak_text)
     
-    # Montar interpretação
-    interpretation = f"Esta propriedade obteve um score MCDA de {score:.1f}/100. "
+    # Montar interpretação (partes em lista, unidas uma única vez no final)
+    parts = [f"Esta propriedade obteve um score MCDA de {score:.1f}/100. "]
     
     if strengths:
-        interpretation += f"Pontos fortes: {', '.join(strengths)}. "
+        parts.append(f"Pontos fortes: {', '.join(strengths)}. ")
     
     if weaknesses:
-        interpretation += f"Pontos de atenção: {', '.join(weaknesses)}. "
+        parts.append(f"Pontos de atenção: {', '.join(weaknesses)}. ")
         
     # Recomendação geral
-    if score >= 70:
-        interpretation += "✅ Recomendada para desenvolvimento de planta de biogás."
-    elif score >= 50:
-        interpretation += "⚠️ Viável com estudos adicionais e planejamento cuidadoso."
-    else:
-        interpretation += "❌ Não recomendada devido aos desafios identificados."
-    
-    return interpretation
\ No newline at end of file
+    parts.append(RECOMMENDATION_TEXTS[bisect_right(RECOMMENDATION_THRESHOLDS, score)])
+    
+    return "".join(parts)
\ No newline at end of file
@@ -3,26 +3,101 @@ Minimal filter interface that doesn't interfere with map visibility
 """
 
 import streamlit as st
-import pandas as pd
-from typing import Dict, List, Any, Optional
-try:
-    from .filters import RESIDUE_TYPES, AGGREGATE_TYPES, apply_residue_filters
-except ImportError:
-    from components.filters import RESIDUE_TYPES, AGGREGATE_TYPES, apply_residue_filters
+from dataclasses import dataclass
+from typing import Optional, Tuple
 
 
-def render_minimal_filters(key_prefix: str = "main", show_in_sidebar: bool = False) -> Dict[str, Any]:
+@dataclass(slots=True, frozen=True)
+class FilterState:
+    """Filters chosen in one of the panels (immutable and hashable, usable as a cache key)"""
+    view_mode: str
+    selected_residues: Tuple[str, ...]
+    show_zero_values: bool
+    max_results: Optional[int]
+    min_potential: int = 0
+    sort_by: str = "Total Potential"
+    sort_ascending: bool = False
+    display_column: Optional[str] = None
+
+
+# Session key holding the applied FilterState; the filter panels run as fragments, so
+# widget changes only rerun the panel and the page reads the filters from here
+FILTER_STATE_KEY = "filter_state"
+
+# Residue groups of the sidebar "Individual Types" mode: (label, widget key suffix, residue columns)
+SIDEBAR_RESIDUE_GROUPS = (
+    ("🌾 Agricultural", "agricultural", ('biogas_cana_nm_ano', 'biogas_soja_nm_ano', 'biogas_milho_nm_ano',
+                                         'biogas_cafe_nm_ano', 'biogas_citros_nm_ano')),
+    ("🐄 Livestock", "livestock", ('biogas_bovinos_nm_ano', 'biogas_suino_nm_ano', 'biogas_aves_nm_ano',
+                                   'biogas_piscicultura_nm_ano')),
+    ("🗑️ Urban", "urban", ('rsu_potencial_nm_habitante_ano', 'rpo_potencial_nm_habitante_ano')),
+    ("🌲 Forestry", "forestry", ('silvicultura_nm_ano',)),
+)
+
+# Checkboxes of the minimal panel's "Individual" mode: (group, ((label, residue column, widget key suffix), ...))
+MINIMAL_RESIDUE_MENU = (
+    ("Agricultural", (("🌾 Sugar Cane", 'biogas_cana_nm_ano', "cana"),
+                      ("🌱 Soybean", 'biogas_soja_nm_ano', "soja"),
+                      ("🌽 Corn", 'biogas_milho_nm_ano', "milho"))),
+    ("Livestock", (("🐄 Cattle", 'biogas_bovinos_nm_ano', "bovinos"),
+                   ("🐷 Swine", 'biogas_suino_nm_ano', "suino"),
+                   ("🐔 Poultry", 'biogas_aves_nm_ano', "aves"))),
+    ("Urban", (("🗑️ Municipal Waste", 'rsu_potencial_nm_habitante_ano', "rsu"),
+               ("🍃 Garden Waste", 'rpo_potencial_nm_habitante_ano', "rpo"))),
+)
+
+SIDEBAR_RESIDUE_LABELS = {
+    'biogas_cana_nm_ano': "Sugar Cane",
+    'biogas_soja_nm_ano': "Soybean",
+    'biogas_milho_nm_ano': "Corn",
+    'biogas_cafe_nm_ano': "Coffee",
+    'biogas_citros_nm_ano': "Citrus",
+    'biogas_bovinos_nm_ano': "Cattle",
+    'biogas_suino_nm_ano': "Swine",
+    'biogas_aves_nm_ano': "Poultry",
+    'biogas_piscicultura_nm_ano': "Fish Farming",
+    'rsu_potencial_nm_habitante_ano': "Municipal Waste",
+    'rpo_potencial_nm_habitante_ano': "Garden Waste",
+    'silvicultura_nm_ano': "Forestry",
+}
+
+
+def _apply_filter_state(filters: FilterState, key_prefix: str) -> None:
+    """
+    Applies the panel's filters immediately on first render, afterwards only when
+    the user clicks Apply (which reruns the whole page so the map picks them up)
+    """
+    if FILTER_STATE_KEY not in st.session_state:
+        st.session_state[FILTER_STATE_KEY] = filters
+    
+    if st.button("✅ Apply filters", key=f"{key_prefix}_apply", help="Update the map with these filters"):
+        st.session_state[FILTER_STATE_KEY] = filters
+        st.rerun(scope="app")
+
+
+def render_minimal_filters(key_prefix: str = "main", show_in_sidebar: bool = False) -> FilterState:
     """
     Renders minimal, non-intrusive filters
+    Returns the applied FilterState (st.session_state[FILTER_STATE_KEY])
     """
     
     if show_in_sidebar:
-        container = st.sidebar
-        container.markdown("## 🎯 Quick Filters")
+        # The fragment is called inside the sidebar; fragments can't write to containers created outside them
+        with st.sidebar:
+            st.markdown("## 🎯 Quick Filters")
+            _minimal_filters_fragment(key_prefix)
     else:
         # Create a collapsible expander in main content
         with st.expander("🎯 **Filters & Options**", expanded=False):
-            container = st
+            _minimal_filters_fragment(key_prefix)
+    
+    return st.session_state[FILTER_STATE_KEY]
+
+
+@st.fragment
+def _minimal_filters_fragment(key_prefix: str) -> None:
+    """Widgets of render_minimal_filters; reruns on its own when a filter changes"""
+    container = st
     
     # Quick residue type selection
     container.markdown("**Select Data to Display:**")
@@ -58,33 +133,13 @@ def render_minimal_filters(key_prefix: str = "main", show_in_sidebar: bool = Fal
     if view_mode == "Individual":
         container.markdown("**Choose Specific Residues:**")
         
-        # Quick buttons for common residues
-        col1, col2, col3 = container.columns(3)
-        
-        with col1:
-            container.markdown("*Agricultural:*")
-            if container.checkbox("🌾 Sugar Cane", key=f"{key_prefix}_cana"):
-                selected_residues.append('biogas_cana_nm_ano')
-            if container.checkbox("🌱 Soybean", key=f"{key_prefix}_soja"):
-                selected_residues.append('biogas_soja_nm_ano')
-            if container.checkbox("🌽 Corn", key=f"{key_prefix}_milho"):
-                selected_residues.append('biogas_milho_nm_ano')
-        
-        with col2:
-            container.markdown("*Livestock:*")
-            if container.checkbox("🐄 Cattle", key=f"{key_prefix}_bovinos"):
-                selected_residues.append('biogas_bovinos_nm_ano')
-            if container.checkbox("🐷 Swine", key=f"{key_prefix}_suino"):
-                selected_residues.append('biogas_suino_nm_ano')
-            if container.checkbox("🐔 Poultry", key=f"{key_prefix}_aves"):
-                selected_residues.append('biogas_aves_nm_ano')
-        
-        with col3:
-            container.markdown("*Urban:*")
-            if container.checkbox("🗑️ Municipal Waste", key=f"{key_prefix}_rsu"):
-                selected_residues.append('rsu_potencial_nm_habitante_ano')
-            if container.checkbox("🍃 Garden Waste", key=f"{key_prefix}_rpo"):
-                selected_residues.append('rpo_potencial_nm_habitante_ano')
+        # Quick buttons for common residues, one column per group
+        for column, (group_label, residues) in zip(container.columns(len(MINIMAL_RESIDUE_MENU)), MINIMAL_RESIDUE_MENU):
+            with column:
+                container.markdown(f"*{group_label}:*")
+                for label, residue, key_suffix in residues:
+                    if container.checkbox(label, key=f"{key_prefix}_{key_suffix}"):
+                        selected_residues.append(residue)
     
     # Convert view mode to residue list
     elif view_mode == "Agricultural":
@@ -96,20 +151,26 @@ def render_minimal_filters(key_prefix: str = "main", show_in_sidebar: bool = Fal
     else:  # All Sources
         selected_residues = ['total_final_nm_ano']
     
-    return {
-        "view_mode": view_mode,
-        "selected_residues": selected_residues,
-        "show_zero_values": show_zeros,
-        "max_results": max_results if max_results != "All" else None,
-        "min_potential": 0,
-        "sort_by": "Total Potential"
-    }
+    _apply_filter_state(FilterState(
+        view_mode=view_mode,
+        selected_residues=tuple(selected_residues),
+        show_zero_values=show_zeros,
+        max_results=max_results if max_results != "All" else None
+    ), key_prefix)
 
 
-def render_floating_filter_controls() -> Dict[str, Any]:
+def render_floating_filter_controls() -> FilterState:
     """
     Renders floating filter controls that don't take up main space
+    Returns the applied FilterState (st.session_state[FILTER_STATE_KEY])
     """
+    _floating_filter_controls_fragment()
+    return st.session_state[FILTER_STATE_KEY]
+
+
+@st.fragment
+def _floating_filter_controls_fragment() -> None:
+    """Widgets of render_floating_filter_controls; reruns on its own when a filter changes"""
     
     # Create columns for horizontal layout
     col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
@@ -121,7 +182,8 @@ def render_floating_filter_controls() -> Dict[str, Any]:
         # Create button row
         btn_col1, btn_col2, btn_col3, btn_col4, btn_col5 = st.columns(5)
         
-        selected_view = "All Sources"  # default
+        # Last clicked view is kept in session state so it survives the Apply rerun
+        selected_view = st.session_state.get("quick_filter_view", "All Sources")
         
         with btn_col1:
             if st.button("🌾 Agricultural", help="Show agricultural residues"):
@@ -170,25 +232,34 @@ def render_floating_filter_controls() -> Dict[str, Any]:
     else:  # All Sources
         selected_residues = ['total_final_nm_ano']
     
-    return {
-        "view_mode": selected_view,
-        "selected_residues": selected_residues,
-        "show_zero_values": show_zeros,
-        "max_results": max_results if max_results != "All" else None,
-        "sort_by": "Total Potential",
-        "sort_ascending": sort_order != "Highest first"
-    }
+    _apply_filter_state(FilterState(
+        view_mode=selected_view,
+        selected_residues=tuple(selected_residues),
+        show_zero_values=show_zeros,
+        max_results=max_results if max_results != "All" else None,
+        sort_ascending=sort_order != "Highest first"
+    ), "floating")
 
 
-def render_sidebar_filters(key_prefix: str = "sidebar") -> Dict[str, Any]:
+def render_sidebar_filters(key_prefix: str = "sidebar") -> FilterState:
     """
     Renders filters in sidebar without taking main content space
+    Returns the applied FilterState (st.session_state[FILTER_STATE_KEY])
     """
+    # The fragment is called inside the sidebar; fragments can't write to containers created outside them
+    with st.sidebar:
+        _sidebar_filters_fragment(key_prefix)
+    return st.session_state[FILTER_STATE_KEY]
+
+
+@st.fragment
+def _sidebar_filters_fragment(key_prefix: str) -> None:
+    """Widgets of render_sidebar_filters; reruns on its own when a filter changes"""
     
-    st.sidebar.markdown("## 🎯 Data Filters")
+    st.markdown("## 🎯 Data Filters")
     
     # View mode
-    view_mode = st.sidebar.selectbox(
+    view_mode = st.selectbox(
         "**Data to Display:**",
         ["All Sources", "Agricultural", "Livestock", "Urban", "Individual Types"],
         key=f"{key_prefix}_view",
@@ -198,43 +269,16 @@ def render_sidebar_filters(key_prefix: str = "sidebar") -> Dict[str, Any]:
     # Individual selection for Individual Types mode
     selected_residues = []
     if view_mode == "Individual Types":
-        st.sidebar.markdown("**Select Residues:**")
-        
-        # Agricultural
-        with st.sidebar.expander("🌾 Agricultural", expanded=False):
-            if st.checkbox("Sugar Cane", key=f"{key_prefix}_cana"):
-                selected_residues.append('biogas_cana_nm_ano')
-            if st.checkbox("Soybean", key=f"{key_prefix}_soja"):
-                selected_residues.append('biogas_soja_nm_ano')
-            if st.checkbox("Corn", key=f"{key_prefix}_milho"):
-                selected_residues.append('biogas_milho_nm_ano')
-            if st.checkbox("Coffee", key=f"{key_prefix}_cafe"):
-                selected_residues.append('biogas_cafe_nm_ano')
-            if st.checkbox("Citrus", key=f"{key_prefix}_citros"):
-                selected_residues.append('biogas_citros_nm_ano')
-        
-        # Livestock
-        with st.sidebar.expander("🐄 Livestock", expanded=False):
-            if st.checkbox("Cattle", key=f"{key_prefix}_bovinos"):
-                selected_residues.append('biogas_bovinos_nm_ano')
-            if st.checkbox("Swine", key=f"{key_prefix}_suino"):
-                selected_residues.append('biogas_suino_nm_ano')
-            if st.checkbox("Poultry", key=f"{key_prefix}_aves"):
-                selected_residues.append('biogas_aves_nm_ano')
-            if st.checkbox("Fish Farming", key=f"{key_prefix}_piscicultura"):
-                selected_residues.append('biogas_piscicultura_nm_ano')
-        
-        # Urban
-        with st.sidebar.expander("🗑️ Urban", expanded=False):
-            if st.checkbox("Municipal Waste", key=f"{key_prefix}_rsu"):
-                selected_residues.append('rsu_potencial_nm_habitante_ano')
-            if st.checkbox("Garden Waste", key=f"{key_prefix}_rpo"):
-                selected_residues.append('rpo_potencial_nm_habitante_ano')
+        st.markdown("**Select Residues:**")
         
-        # Forestry
-        with st.sidebar.expander("🌲 Forestry", expanded=False):
-            if st.checkbox("Forestry", key=f"{key_prefix}_silvicultura"):
-                selected_residues.append('silvicultura_nm_ano')
+        # One multiselect per residue group instead of one checkbox per residue
+        for group_label, group_key, options in SIDEBAR_RESIDUE_GROUPS:
+            selected_residues.extend(st.multiselect(
+                group_label,
+                options,
+                format_func=SIDEBAR_RESIDUE_LABELS.__getitem__,
+                key=f"{key_prefix}_{group_key}"
+            ))
     
     else:
         # Convert view mode to residue list
@@ -247,19 +291,19 @@ def render_sidebar_filters(key_prefix: str = "sidebar") -> Dict[str, Any]:
         else:  # All Sources
             selected_residues = ['total_final_nm_ano']
     
-    st.sidebar.markdown("---")
+    st.markdown("---")
     
     # Additional options
-    st.sidebar.markdown("**Display Options:**")
+    st.markdown("**Display Options:**")
     
-    show_zeros = st.sidebar.checkbox(
+    show_zeros = st.checkbox(
         "Include zero values",
         value=False,
         key=f"{key_prefix}_zeros",
         help="Show municipalities with zero biogas potential"
     )
     
-    max_results = st.sidebar.selectbox(
+    max_results = st.selectbox(
         "Maximum results:",
         [25, 50, 100, 250, "All"],
         index=2,
@@ -267,7 +311,7 @@ def render_sidebar_filters(key_prefix: str = "sidebar") -> Dict[str, Any]:
         help="Limit number of municipalities shown"
     )
     
-    min_potential = st.sidebar.number_input(
+    min_potential = st.number_input(
         "Minimum potential (Nm³/ano):",
         min_value=0,
         value=0,
@@ -276,12 +320,11 @@ def render_sidebar_filters(key_prefix: str = "sidebar") -> Dict[str, Any]:
         help="Filter by minimum biogas potential"
     )
     
-    return {
-        "view_mode": view_mode,
-        "selected_residues": selected_residues,
-        "show_zero_values": show_zeros,
-        "max_results": max_results if max_results != "All" else None,
-        "min_potential": min_potential,
-        "sort_by": "Total Potential",
-        "display_column": selected_residues[0] if len(selected_residues) == 1 else "total_final_nm_ano"
-    }
\ No newline at end of file
+    _apply_filter_state(FilterState(
+        view_mode=view_mode,
+        selected_residues=tuple(selected_residues),
+        show_zero_values=show_zeros,
+        max_results=max_results if max_results != "All" else None,
+        min_potential=min_potential,
+        display_column=selected_residues[0] if len(selected_residues) == 1 else "total_final_nm_ano"
+    ), key_prefix)
\ No newline at end of file
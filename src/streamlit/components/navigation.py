@@ -4,8 +4,60 @@ Includes both sidebar navigation and WebGIS top navigation bar
 """
 
 import streamlit as st
+from types import MappingProxyType
 from typing import Dict, Any
 
+# Sidebar navigation entries: (button label, page key)
+NAVIGATION_PAGES = (
+    ("🏠 Dashboard", "dashboard"),
+    ("🎯 Simulations", "simulations"),
+    ("📈 Analysis", "analysis"),
+    ("📋 Data Explorer", "data"),
+    ("📚 References", "references"),
+    ("🔧 Debug", "debug")
+)
+
+# Per-page configuration returned by get_page_config (read-only, built once at import)
+PAGE_CONFIGS = MappingProxyType({
+    "dashboard": {
+        "title": "🏠 Executive Dashboard",
+        "subtitle": "Overview of biogas potential across São Paulo municipalities",
+        "show_filters": True,
+        "default_view": "overview"
+    },
+    "simulations": {
+        "title": "🎯 Scenario Simulations", 
+        "subtitle": "Model different scenarios and their impact on biogas potential",
+        "show_filters": True,
+        "default_view": "simulation"
+    },
+    "analysis": {
+        "title": "📈 Detailed Analysis",
+        "subtitle": "Deep dive into individual residue types and comparative analysis", 
+        "show_filters": True,
+        "default_view": "analysis"
+    },
+    "data": {
+        "title": "📋 Data Explorer",
+        "subtitle": "Explore and export raw data with advanced filtering",
+        "show_filters": True,
+        "default_view": "table"
+    },
+    "debug": {
+        "title": "🔧 Debug & System Info",
+        "subtitle": "Technical information and troubleshooting",
+        "show_filters": False,
+        "default_view": "debug"
+    },
+    "references": {
+        "title": "📚 Scientific References",
+        "subtitle": "Comprehensive scientific bibliography and citations for biogas conversion factors",
+        "show_filters": False,
+        "default_view": "references"
+    },
+})
+
+
 def render_navigation_sidebar() -> str:
     """
     Renders expanded navigation sidebar with page selection and filters
@@ -20,33 +72,24 @@ def render_navigation_sidebar() -> str:
     # Page navigation with clickable buttons
     st.sidebar.markdown("## 📍 Navigation")
     
-    pages = [
-        {"label": "🏠 Dashboard", "key": "dashboard"},
-        {"label": "🎯 Simulations", "key": "simulations"}, 
-        {"label": "📈 Analysis", "key": "analysis"},
-        {"label": "📋 Data Explorer", "key": "data"},
-        {"label": "📚 References", "key": "references"},
-        {"label": "🔧 Debug", "key": "debug"}
-    ]
-    
     # Get current page from session state, default to dashboard
     current_page = st.session_state.get('current_page', 'dashboard')
     
     # Create navigation buttons
     selected_page = current_page  # Default to current
     
-    for page in pages:
+    for label, page_key in NAVIGATION_PAGES:
         # Highlight current page button
-        is_current = (page["key"] == current_page)
+        is_current = (page_key == current_page)
         button_type = "primary" if is_current else "secondary"
         
         if st.sidebar.button(
-            page["label"], 
-            key=f"nav_{page['key']}", 
+            label, 
+            key=f"nav_{page_key}", 
             use_container_width=True,
             type=button_type
         ):
-            selected_page = page["key"]
+            selected_page = page_key
             st.session_state.current_page = selected_page
             st.rerun()
     
@@ -157,48 +200,9 @@ def render_navigation_sidebar() -> str:
 
 def get_page_config(page: str) -> Dict[str, Any]:
     """
-    Returns configuration for each page
+    Returns configuration for each page (shared module-level dict, treat as read-only)
     """
-    configs = {
-        "dashboard": {
-            "title": "🏠 Executive Dashboard",
-            "subtitle": "Overview of biogas potential across São Paulo municipalities",
-            "show_filters": True,
-            "default_view": "overview"
-        },
-        "simulations": {
-            "title": "🎯 Scenario Simulations", 
-            "subtitle": "Model different scenarios and their impact on biogas potential",
-            "show_filters": True,
-            "default_view": "simulation"
-        },
-        "analysis": {
-            "title": "📈 Detailed Analysis",
-            "subtitle": "Deep dive into individual residue types and comparative analysis", 
-            "show_filters": True,
-            "default_view": "analysis"
-        },
-        "data": {
-            "title": "📋 Data Explorer",
-            "subtitle": "Explore and export raw data with advanced filtering",
-            "show_filters": True,
-            "default_view": "table"
-        },
-        "debug": {
-            "title": "🔧 Debug & System Info",
-            "subtitle": "Technical information and troubleshooting",
-            "show_filters": False,
-            "default_view": "debug"
-        },
-        "references": {
-            "title": "📚 Scientific References",
-            "subtitle": "Comprehensive scientific bibliography and citations for biogas conversion factors",
-            "show_filters": False,
-            "default_view": "references"
-        },
-    }
-    
-    return configs.get(page, configs["dashboard"])
+    return PAGE_CONFIGS.get(page, PAGE_CONFIGS["dashboard"])
 
 
 def render_webgis_navigation() -> Dict[str, Any]:
@@ -1,8 +1,13 @@
 import pandas as pd
 import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
 from shapely.geometry import shape, Polygon
 import json
 import logging
+import os
 from tqdm import tqdm
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -12,6 +17,13 @@ INPUT_CSV = "./CP2B_Resultados_Finais.csv"
 OUTPUT_GEOPARQUET = "./CP2B_Processed_Geometries.geoparquet"
 SIMPLIFY_TOLERANCE = 0.0001
 
+# Click-detection sidecars read (never written) by the invisible map
+MCDA_GEOPARQUET_TEMPLATE = "./CP2B_MCDA_{radius}.geoparquet"
+PREPROC_PARQUET_TEMPLATE = "./CP2B_MCDA_{radius}.preproc.parquet"
+MCDA_RADII = ('10km', '30km', '50km')
+# Same precision as data_loader.COORDINATE_PRECISION, so the sidecar matches the loaded geometries
+COORDINATE_PRECISION = 1e-5
+
 def process_and_save_geometries_final():
     """
     Final, robust version. It specifically targets the correct '.geo' column
@@ -93,5 +105,38 @@ def process_and_save_geometries_final():
     except Exception as e:
         logging.error(f"❌ An error occurred during final pre-processing: {e}")
         
+def build_click_sidecar(radius):
+    """
+    Writes the click-detection sidecar for a radius scenario: cod_imovel,
+    WKB geometry and bounding box per property. The file is written to a
+    temporary path and renamed, so readers never see a partial file.
+    """
+    try:
+        source = MCDA_GEOPARQUET_TEMPLATE.format(radius=radius)
+        output = PREPROC_PARQUET_TEMPLATE.format(radius=radius)
+        logging.info(f"🔄 Building click sidecar from {source}...")
+        gdf = gpd.read_parquet(source, columns=['cod_imovel', 'geometry'])
+
+        geometries = shapely.set_precision(np.asarray(gdf.geometry.values), COORDINATE_PRECISION, mode='pointwise')
+        bounds = shapely.bounds(geometries)
+        table = pa.table({
+            'cod_imovel': gdf['cod_imovel'].astype(str).to_numpy(),
+            'geom_wkb': shapely.to_wkb(geometries),
+            'minx': bounds[:, 0],
+            'miny': bounds[:, 1],
+            'maxx': bounds[:, 2],
+            'maxy': bounds[:, 3],
+        })
+
+        tmp_output = output + ".tmp"
+        pq.write_table(table, tmp_output)
+        os.replace(tmp_output, output)
+        logging.info(f"💾 Saved {len(gdf)} rows to {output}")
+
+    except Exception as e:
+        logging.error(f"❌ An error occurred while building the click sidecar for {radius}: {e}")
+
 if __name__ == "__main__":
-    process_and_save_geometries_final()
\ No newline at end of file
+    process_and_save_geometries_final()
+    for radius in MCDA_RADII:
+        build_click_sidecar(radius)
\ No newline at end of file
@@ -0,0 +1,13 @@
+# Configuração compartilhada dos testes (pytest)
+# src/streamlit entra no sys.path pelo pytest.ini (pythonpath), como no `streamlit run app.py`
+
+import pytest
+import streamlit as st
+
+
+@pytest.fixture(autouse=True)
+def clear_streamlit_caches():
+    """Limpa st.cache_data/st.cache_resource após cada teste, para nenhum resultado em cache vazar para o próximo"""
+    yield
+    st.cache_data.clear()
+    st.cache_resource.clear()
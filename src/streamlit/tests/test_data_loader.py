@@ -0,0 +1,59 @@
+# Testes do carregador MCDA (data_loader)
+# Compara a busca via code_index com a varredura da coluna cod_imovel
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.mcda.data_loader import build_code_index, find_property_row
+
+
+@pytest.fixture
+def properties_df():
+    """Propriedades com índice embaralhado: após reset_index os rótulos 0..k-1 apontam para outras linhas"""
+    rng = np.random.default_rng(7)
+    n = 300
+    return pd.DataFrame({
+        'cod_imovel': [f"SP-{3500000 + i:07d}-{i * 7919 % 100000:05X}" for i in range(n)],
+        'municipio': rng.choice(['Campinas', 'Piracicaba', 'Limeira', 'Sumaré'], size=n),
+        'mcda_score': rng.uniform(0, 100, size=n).round(2)
+    }, index=pd.Index(rng.permutation(n)))
+
+
+def reference_find_row(df, cod_imovel):
+    matches = df[df['cod_imovel'] == cod_imovel]
+    return matches.iloc[0] if len(matches) else None
+
+
+def test_build_code_index_maps_codes_to_labels(properties_df):
+    build_code_index(properties_df)
+    code_index = properties_df.attrs['code_index'].value
+    assert code_index == dict(zip(properties_df['cod_imovel'], properties_df.index))
+
+
+def test_build_code_index_skips_duplicate_labels(properties_df):
+    duplicated = pd.concat([properties_df, properties_df.iloc[:3]])
+    build_code_index(duplicated)
+    assert 'code_index' not in duplicated.attrs
+
+
+def test_find_property_row_matches_scan(properties_df):
+    build_code_index(properties_df)
+    subsets = {
+        'completo': properties_df,
+        'filtrado': properties_df[properties_df['mcda_score'] >= 50],
+        'fatiado': properties_df.iloc[::3],
+        'reset_index': properties_df[properties_df['municipio'] == 'Campinas'].reset_index(drop=True),
+        'sem_indice': properties_df.iloc[10:40].copy()
+    }
+    subsets['sem_indice'].attrs.pop('code_index', None)
+    codes = list(properties_df['cod_imovel'].iloc[::7]) + ['SP-INEXISTENTE']
+
+    for name, subset in subsets.items():
+        for code in codes:
+            result = find_property_row(subset, code)
+            expected = reference_find_row(subset, code)
+            if expected is None:
+                assert result is None, (name, code)
+            else:
+                pd.testing.assert_series_equal(result, expected)
@@ -0,0 +1,60 @@
+# Testes do mapa invisível (invisible_map)
+# Compara a detecção de clique com a varredura original por geometry.contains
+
+import numpy as np
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point, Polygon, box
+
+from components.mcda.invisible_map import detect_property_at_coordinates
+
+
+@pytest.fixture
+def polygons_gdf():
+    """Quadrados em grade com polígonos irregulares sobrepostos (a primeira linha que contém o ponto vence)"""
+    geometries = []
+    for i in range(8):
+        for j in range(8):
+            geometries.append(box(-47.2 + i * 0.01, -22.9 + j * 0.01, -47.2 + (i + 1) * 0.01, -22.9 + (j + 1) * 0.01))
+    rng = np.random.default_rng(11)
+    for _ in range(20):
+        cx, cy = rng.uniform(-47.2, -47.12), rng.uniform(-22.9, -22.82)
+        angles = np.sort(rng.uniform(0, 2 * np.pi, size=6))
+        radii = rng.uniform(0.002, 0.01, size=6)
+        geometries.insert(int(rng.integers(len(geometries))),
+                          Polygon(zip(cx + radii * np.cos(angles), cy + radii * np.sin(angles))))
+    return gpd.GeoDataFrame({
+        'cod_imovel': [f"SP-{i:05d}" for i in range(len(geometries))],
+        'mcda_score': np.linspace(0, 100, len(geometries))
+    }, geometry=geometries, crs='EPSG:4326')
+
+
+def reference_detect(click_lat, click_lon, gdf):
+    click_point = Point(click_lon, click_lat)
+    for geometry, cod_imovel in zip(gdf.geometry, gdf['cod_imovel']):
+        if geometry.contains(click_point):
+            return cod_imovel
+    return None
+
+
+def test_detect_property_matches_contains(polygons_gdf):
+    rng = np.random.default_rng(3)
+    lons = rng.uniform(-47.21, -47.11, size=400)
+    lats = rng.uniform(-22.91, -22.81, size=400)
+    # Pontos sobre as bordas e vértices da grade (contains exclui a fronteira; o float32 não pode excluir o interior)
+    lons = np.concatenate([lons, np.full(9, -47.15), -47.2 + np.arange(9) * 0.01])
+    lats = np.concatenate([lats, -22.9 + np.arange(9) * 0.01, np.full(9, -22.855)])
+
+    for lat, lon in zip(lats, lons):
+        assert detect_property_at_coordinates(lat, lon, polygons_gdf) == reference_detect(lat, lon, polygons_gdf)
+
+
+def test_detect_property_on_filtered_rows(polygons_gdf):
+    filtered = polygons_gdf[polygons_gdf['mcda_score'] >= 40]
+    rng = np.random.default_rng(5)
+    for lat, lon in zip(rng.uniform(-22.9, -22.82, size=200), rng.uniform(-47.2, -47.12, size=200)):
+        assert detect_property_at_coordinates(lat, lon, filtered) == reference_detect(lat, lon, filtered)
+
+
+def test_detect_property_empty_frame(polygons_gdf):
+    assert detect_property_at_coordinates(-22.85, -47.15, polygons_gdf.iloc[:0]) is None
@@ -0,0 +1,70 @@
+# Testes do mapa MCDA (map_component)
+# Compara apply_mcda_filters com os filtros encadeados originais
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from components.mcda.map_component import apply_mcda_filters
+
+
+@pytest.fixture
+def properties_df():
+    rng = np.random.default_rng(7)
+    n = 300
+    return pd.DataFrame({
+        'cod_imovel': [f"SP-{3500000 + i:07d}-{i * 7919 % 100000:05X}" for i in range(n)],
+        'municipio': pd.Categorical(rng.choice(['Campinas', 'Piracicaba', 'Limeira', 'Sumaré'], size=n)),
+        'mcda_score': rng.uniform(0, 100, size=n).round(2)
+    }, index=pd.Index(rng.permutation(n)))
+
+
+def reference_filters(df, filters):
+    """Filtros encadeados originais (cópia + filtragens sucessivas + head)"""
+    df_filtered = df.copy()
+    if 'score_min' in filters and 'mcda_score' in df_filtered.columns:
+        df_filtered = df_filtered[df_filtered['mcda_score'] >= filters['score_min']]
+    if filters.get('municipality', 'Todos') != 'Todos' and 'municipio' in df_filtered.columns:
+        df_filtered = df_filtered[df_filtered['municipio'] == filters['municipality']]
+    if filters.get('search_query', '').strip() and 'cod_imovel' in df_filtered.columns:
+        search_term = filters['search_query'].strip().lower()
+        df_filtered = df_filtered[df_filtered['cod_imovel'].str.lower().str.contains(search_term, na=False)]
+    if 'max_properties' in filters:
+        df_filtered = df_filtered.head(filters['max_properties'])
+    return df_filtered
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {'score_min': 0, 'municipality': 'Todos', 'search_query': '', 'max_properties': 8000},
+    {'score_min': 50, 'municipality': 'Todos', 'search_query': '', 'max_properties': 8000},
+    {'score_min': 30, 'municipality': 'Campinas', 'search_query': '', 'max_properties': 8000},
+    {'score_min': 20, 'municipality': 'Limeira', 'search_query': '', 'max_properties': 5},
+    {'score_min': 101, 'municipality': 'Todos', 'search_query': '', 'max_properties': 8000},
+    {'score_min': 0, 'municipality': 'Inexistente', 'search_query': '', 'max_properties': 8000},
+    {'max_properties': 0}
+])
+def test_apply_mcda_filters_matches_reference(properties_df, filters):
+    pd.testing.assert_frame_equal(apply_mcda_filters(properties_df, filters), reference_filters(properties_df, filters))
+
+
+def test_apply_mcda_filters_empty_frame(properties_df):
+    empty = properties_df.iloc[:0]
+    assert apply_mcda_filters(empty, {'score_min': 50}) is empty
+
+
+@pytest.mark.parametrize("search_query", [' sp-35000 ', 'SP-3500012', 'a', 'f-', 'inexistente'])
+def test_apply_mcda_filters_search_matches_reference(properties_df, search_query):
+    filters = {'score_min': 10, 'municipality': 'Todos', 'search_query': search_query, 'max_properties': 8000}
+    pd.testing.assert_frame_equal(apply_mcda_filters(properties_df, filters), reference_filters(properties_df, filters))
+
+
+def test_apply_mcda_filters_search_is_literal(properties_df):
+    # A busca não interpreta regex: '.' só casa um ponto literal (os códigos não têm pontos)
+    assert apply_mcda_filters(properties_df, {'search_query': '.'}).empty
+
+
+def test_apply_mcda_filters_search_keeps_columns(properties_df):
+    # Os códigos em minúsculas são calculados na busca, sem coluna auxiliar no DataFrame
+    filtered = apply_mcda_filters(properties_df, {'search_query': 'sp-'})
+    assert list(filtered.columns) == list(properties_df.columns)
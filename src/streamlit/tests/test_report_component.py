@@ -0,0 +1,111 @@
+# Testes do relatório MCDA (report_component)
+# Compara as tabelas de faixas e a interpretação com as cadeias if/elif originais
+
+import pytest
+from bisect import bisect_right
+
+from components.mcda import report_component as rc
+
+# Os limites das faixas, seus vizinhos imediatos e valores típicos
+BAND_SAMPLE_VALUES = sorted({
+    v for t in (0, 3, 5, 7, 15, 30, 40, 50, 60, 70, 80, 100)
+    for v in (t - 0.001, t, t + 0.001)
+} | {-1, 12.5, 45, 99.9})
+
+
+def reference_score_band(score):
+    if score >= 80:
+        return "🟢 Excelente"
+    elif score >= 60:
+        return "🟡 Bom"
+    elif score >= 40:
+        return "🟠 Regular"
+    else:
+        return "🔴 Baixo"
+
+
+def reference_restriction_status(restriction_score):
+    return "Baixa" if restriction_score < 3 else "Média" if restriction_score < 7 else "Alta"
+
+
+@pytest.mark.parametrize("value", BAND_SAMPLE_VALUES)
+def test_score_band_matches_reference(value):
+    assert rc.get_score_color_name(value) == reference_score_band(value)
+
+
+@pytest.mark.parametrize("value", BAND_SAMPLE_VALUES)
+def test_restriction_status_matches_reference(value):
+    label = rc.RESTRICTION_STATUS_LABELS[bisect_right(rc.RESTRICTION_STATUS_THRESHOLDS, value)]
+    assert label == reference_restriction_status(value)
+
+
+def reference_distance_status(distance):
+    if distance < 5:
+        return "🟢 Excelente"
+    elif distance < 15:
+        return "🟡 Boa"
+    elif distance < 30:
+        return "🟠 Regular"
+    else:
+        return "🔴 Distante"
+
+
+@pytest.mark.parametrize("value", BAND_SAMPLE_VALUES)
+def test_distance_status_matches_reference(value):
+    label = rc.DISTANCE_STATUS_LABELS[bisect_right(rc.DISTANCE_STATUS_THRESHOLDS, value)]
+    assert label == reference_distance_status(value)
+
+
+
+def reference_interpretation(property_data):
+    """Interpretação original, montada por concatenação de strings"""
+    score = property_data.get('mcda_score', 0)
+    strengths = []
+    weaknesses = []
+    checks = (
+        ('biomass_norm', "excelente disponibilidade de biomassa", "baixa disponibilidade de biomassa"),
+        ('infra_norm', "boa acessibilidade à infraestrutura", "infraestrutura distante"),
+        ('restriction_norm', "poucas restrições ambientais", "muitas restrições ambientais")
+    )
+    for key, strong_text, weak_text in checks:
+        value = property_data.get(key, 0)
+        if value >= 70:
+            strengths.append(strong_text)
+        elif value < 30:
+            weaknesses.append(weak_text)
+
+    interpretation = f"Esta propriedade obteve um score MCDA de {score:.1f}/100. "
+    if strengths:
+        interpretation += f"Pontos fortes: {', '.join(strengths)}. "
+    if weaknesses:
+        interpretation += f"Pontos de atenção: {', '.join(weaknesses)}. "
+    if score >= 70:
+        interpretation += "✅ Recomendada para desenvolvimento de planta de biogás."
+    elif score >= 50:
+        interpretation += "⚠️ Viável com estudos adicionais e planejamento cuidadoso."
+    else:
+        interpretation += "❌ Não recomendada devido aos desafios identificados."
+    return interpretation
+
+
+@pytest.mark.parametrize("property_data", [
+    {},
+    {'mcda_score': 85.25, 'biomass_norm': 90, 'infra_norm': 75, 'restriction_norm': 80},
+    {'mcda_score': 12, 'biomass_norm': 10, 'infra_norm': 5, 'restriction_norm': 20},
+    {'mcda_score': 55.5, 'biomass_norm': 95, 'infra_norm': 50, 'restriction_norm': 15},
+    {'mcda_score': 65, 'biomass_norm': 50, 'infra_norm': 50, 'restriction_norm': 50}
+])
+def test_interpretation_text_matches_reference(property_data):
+    assert rc.generate_mcda_interpretation(property_data) == reference_interpretation(property_data)
+
+
+@pytest.mark.parametrize("value", BAND_SAMPLE_VALUES)
+def test_interpretation_bands_match_reference(value):
+    # Componentes e score variam juntos e em direções opostas para cobrir todas as faixas
+    property_data = {
+        'mcda_score': value,
+        'biomass_norm': value,
+        'infra_norm': 100 - value,
+        'restriction_norm': value
+    }
+    assert rc.generate_mcda_interpretation(property_data) == reference_interpretation(property_data)